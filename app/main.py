@@ -1,8 +1,10 @@
 import os
 import re
+import sys
 import math
 import numpy as np
 from collections import Counter, defaultdict
+from itertools import islice
 from tabulate import tabulate  # pip install tabulate
 
 #  PATH SETUP 
@@ -11,6 +13,14 @@ PROJECT_ROOT = os.path.dirname(THIS_DIR)
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 DATA_PROCESSED_DIR = os.path.join(PROJECT_ROOT, "processed")
 
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+from corpus_store import store_path, create_store, append_documents, load_docs_from_store
+from doc_stats import compute_doc_stats, save_doc_stats, load_doc_stats
+from snapshot import SnapshotManager, build_snapshot, derive_snapshot
+from boolean_ir import boolean_result_set, iter_sorted_results, hit_stats
+
+PAGE_SIZE = 10
+
 #  UTILITAS 
 def ensure_dirs():
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -21,6 +31,8 @@ def load_processed_docs(path=DATA_PROCESSED_DIR):
     if not os.path.exists(path):
         print(f"Folder {path} tidak ditemukan!")
         return docs
+    if os.path.exists(store_path(path)):
+        return load_docs_from_store(store_path(path))
     for filename in os.listdir(path):
         if filename.endswith(".txt"):
             with open(os.path.join(path, filename), "r", encoding="utf-8") as f:
@@ -35,6 +47,7 @@ def run_preprocessing_and_save():
         print("Tidak ada file di folder data/.")
         return
     count = 0
+    stored = []
     for fn in data_files:
         in_path = os.path.join(DATA_DIR, fn)
         out_path = os.path.join(DATA_PROCESSED_DIR, f"CLEAN_{fn}")
@@ -42,7 +55,11 @@ def run_preprocessing_and_save():
             tokens = f.read().lower().split()
         with open(out_path, "w", encoding="utf-8") as f:
             f.write(" ".join(tokens))
+        stored.append((f"CLEAN_{fn}", tokens))
         count += 1
+    create_store(store_path(DATA_PROCESSED_DIR))
+    append_documents(store_path(DATA_PROCESSED_DIR), stored)
+    save_doc_stats(compute_doc_stats(dict(stored)), DATA_PROCESSED_DIR)
     print(f" Preprocessing selesai. {count} file disimpan ke processed/")
 
 #  BUILD INDICES 
@@ -63,39 +80,6 @@ def build_indices_from_processed():
     print(f"Loaded {len(docs)} documents, vocab size: {len(vocabulary)}")
     return docs, vocabulary, inverted
 
-#  BOOLEAN RETRIEVE 
-def boolean_retrieve(query, inverted_index, all_doc_ids):
-    query = query.upper()
-    tokens = re.findall(r'\b\w+\b|AND|OR|NOT', query)
-    if not tokens:
-        return []
-
-    result_set = None
-    current_op = None
-    negate_next = False
-
-    for tok in tokens:
-        if tok in ("AND", "OR"):
-            current_op = tok
-        elif tok == "NOT":
-            negate_next = True
-        else:
-            term = tok.lower()
-            docs_with_term = inverted_index.get(term, set())
-            if negate_next:
-                docs_with_term = set(all_doc_ids) - docs_with_term
-                negate_next = False
-            if result_set is None:
-                result_set = docs_with_term
-            else:
-                if current_op == "AND":
-                    result_set &= docs_with_term
-                elif current_op == "OR":
-                    result_set |= docs_with_term
-                else:
-                    result_set &= docs_with_term
-    return list(result_set) if result_set else []
-
 # BOOLEAN CLI 
 def boolean_query_cli(inverted_index, all_doc_ids, documents):
     if inverted_index is None:
@@ -107,24 +91,35 @@ def boolean_query_cli(inverted_index, all_doc_ids, documents):
         if q.lower() in ("exit", "quit", "back"):
             break
         try:
-            res = boolean_retrieve(q, inverted_index, all_doc_ids)
+            res = boolean_result_set(q, inverted_index, all_doc_ids)
             if not res:
                 print("Tidak ada dokumen yang cocok.")
                 continue
-            print("\nHasil dokumen:", res)
             print(f"Jumlah dokumen cocok: {len(res)} dari {len(all_doc_ids)} "
                   f"({len(res)/len(all_doc_ids)*100:.2f}%)")
             query_terms = [t.lower() for t in re.findall(r'\b\w+\b', q)]
-            print("\nJumlah kemunculan query per dokumen:")
-            for doc_id in res:
-                tokens = [t.lower() for t in documents[doc_id]]
-                count = sum(tokens.count(term) for term in query_terms)
-                print(f"  {doc_id}: {count} kali")
+            # tampilkan per halaman dari heap (tanpa sort penuh); statistik hanya
+            # dihitung untuk dokumen di halaman itu
+            hits = iter_sorted_results(res)
+            shown, page_no, stats_cache = 0, 1, {}
+            while True:
+                print(f"\nHasil dokumen (halaman {page_no}):")
+                for doc_id in islice(hits, PAGE_SIZE):
+                    count = sum(hit_stats(doc_id, documents, query_terms, stats_cache).values())
+                    print(f"  {doc_id}: {count} kali")
+                    shown += 1
+                if shown >= len(res):
+                    break
+                if input("Enter = halaman berikutnya, lainnya = selesai: ").strip():
+                    break
+                page_no += 1
         except Exception as e:
             print("Error:", e)
 
 #  TF-IDF / VSM 
-def compute_tf_idf(documents):
+def compute_tf_idf(documents, dtype=np.float32, doc_stats=None):
+    # float32 cukup untuk ranking dan setengah ukuran float64 (lihat src/quantize.py)
+    # doc_stats (lihat src/doc_stats.py) berisi max_tf yang sudah dihitung saat preprocessing
     all_terms = sorted({t for toks in documents.values() for t in toks})
     term_to_idx = {t:i for i,t in enumerate(all_terms)}
     N = len(documents)
@@ -132,13 +127,13 @@ def compute_tf_idf(documents):
     for toks in documents.values():
         for t in set(toks):
             df[t] += 1
-    idf_vector = np.array([math.log10(N/df[t]) for t in all_terms])
+    idf_vector = np.array([math.log10(N/df[t]) for t in all_terms], dtype=dtype)
 
-    tfidf_matrix = np.zeros((N, len(all_terms)))
+    tfidf_matrix = np.zeros((N, len(all_terms)), dtype=dtype)
     doc_ids = list(documents.keys())
     for i, doc_id in enumerate(doc_ids):
         tf = Counter(documents[doc_id])
-        max_tf = max(tf.values())
+        max_tf = doc_stats[doc_id]["max_tf"] if doc_stats else max(tf.values())
         for t, cnt in tf.items():
             idx = term_to_idx[t]
             tfidf_matrix[i, idx] = (cnt / max_tf) * idf_vector[idx]
@@ -146,7 +141,7 @@ def compute_tf_idf(documents):
 
 def query_to_tfidf_vector(query, term_to_idx, idf_vector):
     tokens = query.lower().split()
-    vec = np.zeros(len(term_to_idx))
+    vec = np.zeros(len(term_to_idx), dtype=idf_vector.dtype)
     tf = Counter(tokens)
     for t, cnt in tf.items():
         if t in term_to_idx:
@@ -212,8 +207,9 @@ def run_evaluation(docs, tfidf_matrix, idf_vector, term_to_idx, doc_ids):
 # MAIN MENU 
 def main_menu():
     ensure_dirs()
-    docs, vocabulary, inverted = None, None, None
-    tfidf_matrix, idf_vector, term_to_idx, doc_ids = None, None, None, None
+    # indeks disimpan sebagai snapshot read-only; setiap build mem-publish
+    # generasi baru sehingga pembaca selalu melihat indeks yang konsisten
+    manager = SnapshotManager()
 
     while True:
         print("\n=== UTS STKI - MAIN MENU ===")
@@ -231,33 +227,40 @@ def main_menu():
         elif choice=="2":
             docs, vocabulary, inverted = build_indices_from_processed()
             if docs:
+                manager.update(lambda old: build_snapshot(
+                    docs, old["generation"] + 1 if old else 1, inverted, vocabulary=vocabulary))
                 print(" Indeks siap digunakan.")
         elif choice=="3":
-            if not docs or not inverted:
-                print("Jalankan Build indices dulu (menu 2).")
-                continue
-            boolean_query_cli(inverted, list(docs.keys()), docs)
+            with manager.reading() as snap:
+                if snap is None:
+                    print("Jalankan Build indices dulu (menu 2).")
+                    continue
+                boolean_query_cli(snap["inverted"], list(snap["doc_ids"]), snap["docs"])
         elif choice=="4":
-            if not docs:
+            if manager.current is None:
                 print("Jalankan Build indices dulu (menu 2).")
                 continue
-            tfidf_matrix, idf_vector, term_to_idx, doc_ids = compute_tf_idf(docs)
+            snap = manager.update(lambda old: derive_snapshot(old, tfidf=compute_tf_idf(
+                old["docs"], doc_stats=load_doc_stats(DATA_PROCESSED_DIR, old["docs"]))))
+            tfidf_matrix, idf_vector, term_to_idx, doc_ids = snap["tfidf"]
             print(" TF-IDF matrix siap. Contoh query:")
             q = "informasi sistem"
             qvec = query_to_tfidf_vector(q, term_to_idx, idf_vector)
             ranking = rank_documents(qvec, tfidf_matrix, doc_ids)
             for doc, score in ranking[:5]:
-                print(f"{doc} | score={score:.4f} | {get_snippet(docs[doc])}")
+                print(f"{doc} | score={score:.4f} | {get_snippet(snap['docs'][doc])}")
         elif choice=="5":
-            if tfidf_matrix is None:
-                print("Bangun TF-IDF dulu (menu 4).")
-                continue
-            interactive_vsm_search(tfidf_matrix, idf_vector, term_to_idx, doc_ids, docs)
+            with manager.reading() as snap:
+                if snap is None or "tfidf" not in snap:
+                    print("Bangun TF-IDF dulu (menu 4).")
+                    continue
+                interactive_vsm_search(*snap["tfidf"], snap["docs"])
         elif choice=="6":
-            if tfidf_matrix is None:
-                print("Bangun TF-IDF dulu (menu 4).")
-                continue
-            run_evaluation(docs, tfidf_matrix, idf_vector, term_to_idx, doc_ids)
+            with manager.reading() as snap:
+                if snap is None or "tfidf" not in snap:
+                    print("Bangun TF-IDF dulu (menu 4).")
+                    continue
+                run_evaluation(snap["docs"], *snap["tfidf"])
         elif choice=="0":
             print("Keluar. Terimakasih.")
             break
@@ -1,7 +1,12 @@
-from collections import defaultdict
+from collections import defaultdict, Counter
+from bisect import bisect_right
 from pathlib import Path
+import heapq
 import re
 
+from fuzzy import resolve_term
+from lexicon import expand_wildcard
+
 # Build inverted index
 def build_inverted_index(processed_docs):
     """
@@ -28,22 +33,21 @@ def build_incidence_matrix(documents, vocabulary):
                 mat[i, term_to_idx[t]] = 1
     return mat, doc_ids
 
-def boolean_retrieve(query, inverted_index, all_doc_ids, stemmer=None, stop_words=None):
+def tokenize_boolean_query(query):
     """
-    Menjalankan Boolean retrieval untuk query seperti:
-        "term1 AND term2", "term1 OR term2", "NOT term1", "(term1 AND term2) OR term3"
+    Memecah query Boolean menjadi token (term, AND, OR, NOT, kurung).
+    Term boleh mengandung wildcard '*', misalnya "inform*".
     """
-    all_docs = set(all_doc_ids)
-    tokens = re.findall(r'\w+|AND|OR|NOT|\(|\)', query.upper())
-
-    def get_docs(term):
-        term = term.lower()
-        if stop_words and term in stop_words:
-            return set()
-        if stemmer:
-            term = stemmer(term)
-        return inverted_index.get(term, set())
+    return re.findall(r'[\w*]+|AND|OR|NOT|\(|\)', query.upper())
 
+def eval_boolean_tokens(tokens, get_docs, negate):
+    """
+    Mengevaluasi token query Boolean dengan precedence AND di atas OR.
+    Parameter:
+        get_docs: fungsi term -> himpunan dokumen (set, bitmap, dst.)
+        negate: fungsi untuk operasi NOT terhadap himpunan dokumen
+    Himpunan hasil cukup mendukung operator & dan |.
+    """
     def eval_expr(tokens):
         stack = []
         op_stack = []
@@ -78,17 +82,117 @@ def boolean_retrieve(query, inverted_index, all_doc_ids, stemmer=None, stop_word
             else:
                 docs = get_docs(tok)
                 if negate_next:
-                    docs = all_docs - docs
+                    docs = negate(docs)
                     negate_next = False
                 stack.append(docs)
             i += 1
 
         while op_stack:
             apply_op()
-        return stack[-1] if stack else set(), i
+        return stack[-1] if stack else None, i
 
     result, _ = eval_expr(tokens)
-    return sorted(result)
+    return result
+
+def boolean_result_set(query, inverted_index, all_doc_ids, stemmer=None, stop_words=None, lexicon=None,
+                       fuzzy_index=None):
+    """
+    Himpunan dokumen hasil Boolean retrieval (belum diurutkan) untuk query seperti:
+        "term1 AND term2", "term1 OR term2", "NOT term1", "(term1 AND term2) OR term3"
+    Jika lexicon (lihat lexicon.py) diberikan, term wildcard seperti "inform*"
+    diekspansi dan postings hasil ekspansi digabung (OR).
+    Jika fuzzy_index (lihat fuzzy.py) diberikan, term yang tidak ada di
+    vocabulary diganti dengan term terdekat.
+    """
+    all_docs = set(all_doc_ids)
+    tokens = tokenize_boolean_query(query)
+
+    def get_docs(term):
+        term = term.lower()
+        if lexicon and "*" in term:
+            docs = set()
+            for t in expand_wildcard(lexicon, term):
+                docs |= inverted_index[t]
+            return docs
+        if stop_words and term in stop_words:
+            return set()
+        if stemmer:
+            term = stemmer(term)
+        if fuzzy_index and term not in inverted_index:
+            term = resolve_term(fuzzy_index, term) or term
+        return inverted_index.get(term, set())
+
+    result = eval_boolean_tokens(tokens, get_docs, lambda docs: all_docs - docs)
+    return result or set()
+
+def boolean_retrieve(query, inverted_index, all_doc_ids, stemmer=None, stop_words=None, lexicon=None,
+                     fuzzy_index=None):
+    """
+    Boolean retrieval, hasil berupa list doc_id terurut.
+    Parameter opsional sama dengan boolean_result_set.
+    """
+    return sorted(boolean_result_set(query, inverted_index, all_doc_ids, stemmer, stop_words, lexicon,
+                                     fuzzy_index))
+
+#  HASIL BERTAHAP & PAGINATION
+def iter_sorted_results(result):
+    """
+    Iterator doc_id dalam urutan naik dari himpunan hasil. Hasil diambil satu
+    per satu dari heap, jadi pemanggil yang berhenti lebih awal tidak membayar sort penuh.
+    """
+    heap = list(result)
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)
+
+def iter_boolean_results(query, inverted_index, all_doc_ids, **kwargs):
+    """Iterator hasil Boolean dalam urutan doc_id (lihat iter_sorted_results)."""
+    return iter_sorted_results(boolean_result_set(query, inverted_index, all_doc_ids, **kwargs))
+
+def paginate_results(result, limit=10, offset=0, cursor=None):
+    """
+    Mengambil satu halaman dari list doc_id terurut (mis. hasil boolean_retrieve);
+    hasil yang bukan list diurutkan dulu. Urutkan sekali lalu panggil per halaman.
+    cursor: doc_id terakhir halaman sebelumnya, dicari dengan bisect (O(log n)).
+    Mengembalikan {"hits", "total", "next_cursor"}; next_cursor None jika habis.
+    """
+    if not isinstance(result, list):
+        result = sorted(result)
+    start = offset + (bisect_right(result, cursor) if cursor is not None else 0)
+    page = result[start:start + limit + 1]
+    hits = page[:limit]
+    return {
+        "hits": hits,
+        "total": len(result),
+        "next_cursor": hits[-1] if len(page) > limit else None,
+    }
+
+def boolean_page(query, inverted_index, all_doc_ids, limit=10, offset=0, cursor=None, **kwargs):
+    """
+    Satu halaman hasil Boolean retrieval tanpa sort penuh: kandidat setelah
+    cursor dipilih dengan heap (O(n log limit)).
+    """
+    result = boolean_result_set(query, inverted_index, all_doc_ids, **kwargs)
+    candidates = result if cursor is None else (d for d in result if d > cursor)
+    page = heapq.nsmallest(offset + limit + 1, candidates)[offset:]
+    hits = page[:limit]
+    return {
+        "hits": hits,
+        "total": len(result),
+        "next_cursor": hits[-1] if len(page) > limit else None,
+    }
+
+def hit_stats(doc_id, documents, query_terms, cache=None):
+    """
+    Statistik per hit (kemunculan term query), dihitung hanya saat diminta.
+    cache: dict opsional {doc_id: Counter} agar dokumen tidak dihitung dua kali.
+    """
+    if cache is None:
+        cache = {}
+    if doc_id not in cache:
+        cache[doc_id] = Counter(t.lower() for t in documents[doc_id])
+    counts = cache[doc_id]
+    return {term: counts[term] for term in query_terms}
 
 # EVALUASI 
 def calculate_precision_recall(retrieved, relevant):
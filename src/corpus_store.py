@@ -0,0 +1,228 @@
+import os
+import json
+import mmap
+import struct
+import time
+import numpy as np
+
+
+#  CORPUS STORE (satu file, memory-mapped)
+#  Layout file corpus.bin: MAGIC lalu satu segmen per append:
+#      token id dokumen baru (uint32)                              <- data
+#      footer segmen: offsets (uint64 x n), lengths (uint32 x n),
+#                     term baru (JSON), doc_id baru (JSON)
+#      trailer: n_docs, panjang JSON term, panjang JSON doc_id,
+#               awal footer, akhir segmen sebelumnya (u64), MAGIC
+#  Tabel doc dan term juga append-only: setiap segmen hanya menyimpan dokumen
+#  dan term yang baru, jadi ukuran file tumbuh sebanding data baru. Reader
+#  mengikuti rantai trailer dari akhir file. Append hanya membaca JSON term
+#  (untuk memberi id term baru); trailer baru ditulis paling akhir dan jika
+#  append gagal, file dipotong kembali ke ukuran semula. Dokumen dibaca sebagai
+#  slice numpy langsung dari mmap (zero-copy).
+
+STORE_FILE = "corpus.bin"
+MAGIC = b"STKICS02"
+TRAILER = struct.Struct("<QQQQQ8s")
+
+def store_path(path):
+    """Path corpus.bin di dalam folder processed."""
+    return os.path.join(path, STORE_FILE)
+
+def _read_trailers(f, size):
+    """Trailer semua segmen, urut dari segmen pertama."""
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("File corpus store rusak atau bukan corpus store")
+    trailers = []
+    end = size
+    while end > len(MAGIC):
+        f.seek(end - TRAILER.size)
+        *fields, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic != MAGIC:
+            raise ValueError("File corpus store rusak atau bukan corpus store")
+        trailers.append(fields)
+        end = fields[4]
+    return trailers[::-1]
+
+def _read_terms(f, trailers):
+    terms = []
+    for n_docs, terms_len, _, footer_start, _ in trailers:
+        f.seek(footer_start + 12 * n_docs)
+        terms.extend(json.loads(f.read(terms_len).decode("utf-8")))
+    return terms
+
+def _read_segments(f, size):
+    offsets, lengths, doc_ids = [], [], []
+    trailers = _read_trailers(f, size)
+    for n_docs, terms_len, doc_ids_len, footer_start, _ in trailers:
+        f.seek(footer_start)
+        offsets.extend(np.frombuffer(f.read(8 * n_docs), dtype=np.uint64).tolist())
+        lengths.extend(np.frombuffer(f.read(4 * n_docs), dtype=np.uint32).tolist())
+        f.seek(terms_len, os.SEEK_CUR)
+        doc_ids.extend(json.loads(f.read(doc_ids_len).decode("utf-8")))
+    return offsets, lengths, doc_ids, _read_terms(f, trailers)
+
+def create_store(path):
+    """Membuat corpus store kosong (menimpa yang lama)."""
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+
+def append_documents(path, docs):
+    """
+    Menambahkan dokumen ke corpus store sebagai satu segmen baru.
+    Parameter:
+        docs: iterable (doc_id, [token1, token2, ...]) atau dict
+    """
+    if not os.path.exists(path):
+        create_store(path)
+    if isinstance(docs, dict):
+        docs = docs.items()
+    old_size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        terms = _read_terms(f, _read_trailers(f, old_size))
+        term_to_id = {t: i for i, t in enumerate(terms)}
+        new_terms, offsets, lengths, doc_ids = [], [], [], []
+        f.seek(old_size)
+        try:
+            for doc_id, tokens in docs:
+                ids = []
+                for t in tokens:
+                    tid = term_to_id.get(t)
+                    if tid is None:
+                        tid = term_to_id[t] = len(term_to_id)
+                        new_terms.append(t)
+                    ids.append(tid)
+                offsets.append(f.tell())
+                lengths.append(len(ids))
+                doc_ids.append(doc_id)
+                f.write(np.asarray(ids, dtype=np.uint32).tobytes())
+
+            footer_start = f.tell()
+            f.write(np.asarray(offsets, dtype=np.uint64).tobytes())
+            f.write(np.asarray(lengths, dtype=np.uint32).tobytes())
+            terms_bytes = json.dumps(new_terms, ensure_ascii=False).encode("utf-8")
+            doc_ids_bytes = json.dumps(doc_ids, ensure_ascii=False).encode("utf-8")
+            f.write(terms_bytes)
+            f.write(doc_ids_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+            f.write(TRAILER.pack(len(doc_ids), len(terms_bytes), len(doc_ids_bytes),
+                                 footer_start, old_size, MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            # kembalikan file ke keadaan sebelum append (trailer lama di akhir file)
+            f.truncate(old_size)
+            raise
+
+def open_store(path):
+    """
+    Membuka corpus store untuk dibaca lewat mmap.
+    Mengembalikan dict berisi mmap, tabel offset, doc_ids, dan terms.
+    """
+    f = open(path, "rb")
+    offsets, lengths, doc_ids, terms = _read_segments(f, os.path.getsize(path))
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return {
+        "file": f,
+        "mmap": mm,
+        "offsets": offsets,
+        "lengths": lengths,
+        "doc_ids": doc_ids,
+        "doc_pos": {d: i for i, d in enumerate(doc_ids)},
+        "terms": terms,
+    }
+
+def close_store(store):
+    store["mmap"].close()
+    store["file"].close()
+
+def doc_token_ids(store, pos):
+    """Token id dokumen ke-pos sebagai array numpy yang langsung menunjuk ke mmap."""
+    return np.frombuffer(store["mmap"], dtype=np.uint32,
+                         count=store["lengths"][pos], offset=store["offsets"][pos])
+
+def get_tokens(store, doc_id):
+    """Akses acak satu dokumen berdasarkan doc_id, dikembalikan sebagai list token."""
+    terms = store["terms"]
+    return [terms[i] for i in doc_token_ids(store, store["doc_pos"][doc_id]).tolist()]
+
+def iter_documents(store):
+    """Streaming (doc_id, array token id) untuk semua dokumen tanpa menyalin data."""
+    for pos, doc_id in enumerate(store["doc_ids"]):
+        yield doc_id, doc_token_ids(store, pos)
+
+def iter_term_counts(store):
+    """
+    Streaming (doc_id, term id unik, tf) per dokumen. np.unique bekerja langsung
+    di atas slice mmap, jadi token tidak pernah diubah menjadi string Python.
+    """
+    for doc_id, ids in iter_documents(store):
+        term_ids, counts = np.unique(ids, return_counts=True)
+        yield doc_id, term_ids, counts
+
+def load_docs_from_store(path):
+    """
+    Loader yang kompatibel dengan load_processed_docs: {doc_id: [token, ...]}.
+    """
+    store = open_store(path)
+    try:
+        terms = store["terms"]
+        return {doc_id: [terms[i] for i in ids.tolist()] for doc_id, ids in iter_documents(store)}
+    finally:
+        close_store(store)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from vsm_ir import load_processed_docs
+
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    path = store_path(data_path)
+    create_store(path)
+    append_documents(path, sorted(docs.items()))
+    print(f"Corpus store ditulis ke {path} ({os.path.getsize(path)} byte, {len(docs)} dokumen)")
+    assert load_docs_from_store(path) == docs
+
+    # append yang gagal di tengah jalan tidak boleh merusak dokumen lama
+    def failing_batch():
+        yield "gagal.txt", ["a", "b"]
+        raise RuntimeError("ingest gagal")
+    try:
+        append_documents(path, failing_batch())
+    except RuntimeError:
+        pass
+    assert load_docs_from_store(path) == docs
+
+    # Perbandingan waktu load: banyak file kecil vs satu file mmap
+    with tempfile.TemporaryDirectory() as tmp:
+        big_dir = os.path.join(tmp, "files")
+        os.makedirs(big_dir)
+        big_store = os.path.join(tmp, STORE_FILE)
+        create_store(big_store)
+        sources = list(docs.values())
+        batch = []
+        for i in range(20000):
+            tokens = sources[i % len(sources)][: 50 + i % 200]
+            name = f"doc_{i:06d}.txt"
+            with open(os.path.join(big_dir, name), "w", encoding="utf-8") as f:
+                f.write(" ".join(tokens))
+            batch.append((name, tokens))
+        append_documents(big_store, batch)
+
+        start = time.perf_counter()
+        n_tokens = sum(len(t) for t in load_processed_docs(big_dir).values())
+        files_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = open_store(big_store)
+        n_ids = sum(len(ids) for _, ids in iter_documents(store))
+        close_store(store)
+        mmap_s = time.perf_counter() - start
+
+        print(f"20000 dokumen: file terpisah {files_s:.3f} s ({n_tokens} token), "
+              f"mmap store {mmap_s:.3f} s ({n_ids} token id)")
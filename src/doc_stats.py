@@ -0,0 +1,115 @@
+import os
+import json
+import math
+from collections import Counter, defaultdict
+
+
+#  STATISTIK PER DOKUMEN
+#  Dihitung sekali saat indexing lalu disimpan ke doc_stats.json, sehingga
+#  TF-IDF, snippet, dan diagnostik tidak perlu menghitung ulang Counter(tokens).
+
+DOC_STATS_FILE = "doc_stats.json"
+WEIGHTINGS = ("tfidf", "log_tfidf")
+
+def term_weight(weighting, tf, max_tf, idf):
+    if weighting == "tfidf":
+        return (tf / max_tf) * idf
+    if weighting == "log_tfidf":
+        return (1 + math.log10(tf)) * idf
+    raise ValueError(f"Pembobotan tidak dikenal: {weighting}")
+
+def compute_doc_stats(docs, top_n=10):
+    """
+    Menghitung statistik tiap dokumen dalam dua pass (df, lalu norm).
+    Parameter:
+        docs: dict {doc_id: [token1, token2, ...]}
+    Mengembalikan {doc_id: {length, unique_terms, max_tf, top_terms, norms}}.
+    """
+    N = len(docs)
+    tfs = {doc_id: Counter(tokens) for doc_id, tokens in docs.items()}
+    df = defaultdict(int)
+    for tf in tfs.values():
+        for term in tf:
+            df[term] += 1
+    idf = {term: math.log10(N / n) for term, n in df.items()}
+
+    stats = {}
+    for doc_id, tf in tfs.items():
+        max_tf = max(tf.values()) if tf else 0
+        norms = {}
+        for weighting in WEIGHTINGS:
+            norms[weighting] = math.sqrt(sum(
+                term_weight(weighting, cnt, max_tf, idf[t]) ** 2 for t, cnt in tf.items()
+            )) if tf else 0.0
+        stats[doc_id] = {
+            "length": len(docs[doc_id]),
+            "unique_terms": len(tf),
+            "max_tf": max_tf,
+            "top_terms": tf.most_common(top_n),
+            "norms": norms,
+        }
+    return stats
+
+def save_doc_stats(stats, path):
+    with open(os.path.join(path, DOC_STATS_FILE), "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False, indent=1)
+
+def load_doc_stats(path, docs=None):
+    """
+    Memuat doc_stats.json; mengembalikan None jika belum pernah dibuat.
+    docs (opsional): korpus saat ini untuk dicek dengan check_doc_stats.
+    """
+    stats_path = os.path.join(path, DOC_STATS_FILE)
+    if not os.path.exists(stats_path):
+        return None
+    with open(stats_path, "r", encoding="utf-8") as f:
+        stats = json.load(f)
+    return stats if docs is None else check_doc_stats(stats, docs)
+
+def check_doc_stats(stats, docs):
+    """
+    Memastikan statistik masih sesuai korpus. docs: {doc_id: [token, ...]},
+    {doc_id: panjang dokumen}, atau list doc_id. Jika himpunan dokumen (dan N) atau panjang dokumen berbeda,
+    statistik dianggap usang (norm-nya dihitung dengan idf korpus lama):
+    peringatan dicetak dan None dikembalikan agar pemanggil menghitung ulang.
+    """
+    if stats is None:
+        return None
+    doc_ids = set(docs)
+    if doc_ids != set(stats):
+        reason = f"{len(stats)} dokumen tersimpan, korpus berisi {len(doc_ids)}"
+    elif isinstance(docs, dict) and any(
+            stats[d]["length"] != (t if isinstance(t, int) else len(t)) for d, t in docs.items()):
+        reason = "panjang dokumen berubah"
+    else:
+        return stats
+    print(f"Peringatan: {DOC_STATS_FILE} usang ({reason}), statistik dihitung ulang. "
+          f"Jalankan preprocess.py untuk memperbarui.")
+    return None
+
+
+#  SNIPPET & DIAGNOSTIK
+
+def top_terms_snippet(stats, doc_id, n=5):
+    """Ringkasan dokumen dari term paling sering, tanpa membaca isi dokumen."""
+    return ", ".join(f"{t}({f})" for t, f in stats[doc_id]["top_terms"][:n])
+
+def print_doc_stats(stats, top_n=10):
+    for doc_id, s in stats.items():
+        print(f"\n {doc_id}")
+        print(f"Jumlah token: {s['length']} | term unik: {s['unique_terms']} | max tf: {s['max_tf']}")
+        print("Norm L2: " + ", ".join(f"{w}={v:.4f}" for w, v in s["norms"].items()))
+        print(f"{top_n} token paling sering:")
+        for tok, freq in s["top_terms"][:top_n]:
+            print(f"  {tok:15s} : {freq}")
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    stats = load_doc_stats(data_path)
+    if stats is None:
+        from vsm_ir import load_processed_docs
+        stats = compute_doc_stats(load_processed_docs(data_path))
+        save_doc_stats(stats, data_path)
+        print(f"Statistik dokumen disimpan ke: {os.path.join(data_path, DOC_STATS_FILE)}")
+    print_doc_stats(stats)
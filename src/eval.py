@@ -3,11 +3,17 @@ import re
 import math
 from collections import Counter, defaultdict
 
+from corpus_store import store_path, load_docs_from_store
+from doc_stats import load_doc_stats
+from filtered_ir import build_filtered_model, filtered_retrieve
+
 
 #  Load dokumen hasil preprocessing
 
 def load_processed_docs(path="data/processed"):
     docs = {}
+    if os.path.exists(store_path(path)):
+        return load_docs_from_store(store_path(path))
     for filename in os.listdir(path):
         if filename.endswith(".txt"):
             with open(os.path.join(path, filename), "r", encoding="utf-8") as f:
@@ -17,7 +23,8 @@ def load_processed_docs(path="data/processed"):
 
 #  Hitung TF-IDF
 
-def compute_tf_idf(docs):
+def compute_tf_idf(docs, doc_stats=None):
+    # doc_stats (lihat doc_stats.py) berisi max_tf yang sudah dihitung saat indexing
     N = len(docs)
     df = defaultdict(int)
     for tokens in docs.values():
@@ -28,7 +35,7 @@ def compute_tf_idf(docs):
     tfidf_docs = {}
     for doc_id, tokens in docs.items():
         tf = Counter(tokens)
-        max_tf = max(tf.values())
+        max_tf = doc_stats[doc_id]["max_tf"] if doc_stats else max(tf.values())
         tfidf_docs[doc_id] = {term: (tf[term] / max_tf) * idf[term] for term in tf}
     return tfidf_docs, idf
 
@@ -51,11 +58,28 @@ def cosine_similarity(vec1, vec2):
     return dot / (norm1 * norm2) if norm1 and norm2 else 0.0
 
 
+def doc_norms(tfidf_docs, doc_stats=None):
+    # norm L2 tiap dokumen: diambil dari doc_stats jika ada, selain itu dihitung sekali
+    if doc_stats:
+        return {doc: doc_stats[doc]["norms"]["tfidf"] for doc in tfidf_docs}
+    return {doc: math.sqrt(sum(w ** 2 for w in vec.values())) for doc, vec in tfidf_docs.items()}
+
+def score_documents(query_vec, tfidf_docs, norms=None):
+    # tanpa norms, cosine_similarity menghitung norm dokumen di setiap query
+    if norms is None:
+        return {doc: cosine_similarity(query_vec, vec) for doc, vec in tfidf_docs.items()}
+    q_norm = math.sqrt(sum(w ** 2 for w in query_vec.values()))
+    scores = {}
+    for doc, vec in tfidf_docs.items():
+        dot = sum(w * vec.get(t, 0.0) for t, w in query_vec.items())
+        scores[doc] = dot / (q_norm * norms[doc]) if q_norm and norms[doc] else 0.0
+    return scores
+
 #   Retrieve top-k dokumen
 
-def retrieve(query, tfidf_docs, idf, top_k=5):
+def retrieve(query, tfidf_docs, idf, top_k=5, norms=None):
     query_vec = vectorize_query(query, idf)
-    scores = {doc: cosine_similarity(query_vec, vec) for doc, vec in tfidf_docs.items()}
+    scores = score_documents(query_vec, tfidf_docs, norms)
     ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
     return ranked[:top_k]
 
@@ -93,7 +117,9 @@ if __name__ == "__main__":
     print(f"Dokumen terbaca: {list(docs.keys())}")
     print(f"Jumlah dokumen: {len(docs)}\n")
 
-    tfidf_docs, idf = compute_tf_idf(docs)
+    doc_stats = load_doc_stats(data_path, docs)
+    tfidf_docs, idf = compute_tf_idf(docs, doc_stats)
+    norms = doc_norms(tfidf_docs, doc_stats)
 
     
     #  Gold set disesuaikan dengan nama file yang ada
@@ -112,7 +138,7 @@ if __name__ == "__main__":
     n = len(queries)
 
     for q, gold in queries.items():
-        results = retrieve(q, tfidf_docs, idf, top_k=k)
+        results = retrieve(q, tfidf_docs, idf, top_k=k, norms=norms)
         p = precision_at_k(results, gold, k)
         ap = average_precision(results, gold, k)
         ndcg = ndcg_at_k(results, gold, k)
@@ -125,3 +151,25 @@ if __name__ == "__main__":
 
     print("-" * 80)
     print(f"{'Rata-rata':50} | {total_p/n:10.2f} | {total_ap/n:7.2f} | {total_ndcg/n:7.2f}")
+
+    # Query yang sama, tetapi operator Boolean dipakai sebagai filter
+    # dan hanya dokumen yang lolos filter yang di-ranking
+    model = build_filtered_model(docs, doc_stats)
+    for scorer in ("cosine", "bm25"):
+        print(f"\nBoolean filter + {scorer}")
+        print("-" * 80)
+        total_p, total_ap, total_ndcg = 0, 0, 0
+        for q, gold in queries.items():
+            results = filtered_retrieve(q, model, top_k=k, scorer=scorer)
+            p = precision_at_k(results, gold, k)
+            ap = average_precision(results, gold, k)
+            ndcg = ndcg_at_k(results, gold, k)
+
+            total_p += p
+            total_ap += ap
+            total_ndcg += ndcg
+
+            print(f"{q:50} | {p:10.2f} | {ap:7.2f} | {ndcg:7.2f}")
+
+        print("-" * 80)
+        print(f"{'Rata-rata':50} | {total_p/n:10.2f} | {total_ap/n:7.2f} | {total_ndcg/n:7.2f}")
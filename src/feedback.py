@@ -0,0 +1,109 @@
+import math
+import time
+import heapq
+
+from vsm_ir import (load_processed_docs, compute_tf_idf, vectorize_query,
+                    precision_at_k, average_precision, ndcg_at_k)
+
+
+#  PSEUDO-RELEVANCE FEEDBACK (Rocchio)
+#  Pass 1 : ranking biasa, skor semua kandidat disimpan.
+#  Pass 2 : query diperluas dengan term berbobot tertinggi dari top-m dokumen
+#           (vektor dokumen terpotong yang sudah di-cache), lalu hanya kandidat
+#           pass 1 yang diberi skor ulang.
+
+def build_feedback_cache(tfidf_docs, n_terms=20):
+    """
+    Cache per dokumen: norm L2 dan vektor terpotong (n_terms bobot terbesar,
+    dinormalisasi dengan norm dokumen penuh).
+    """
+    norms, truncated = {}, {}
+    for doc_id, vec in tfidf_docs.items():
+        norm = math.sqrt(sum(w ** 2 for w in vec.values()))
+        norms[doc_id] = norm
+        top = heapq.nlargest(n_terms, vec.items(), key=lambda x: x[1])
+        truncated[doc_id] = {t: w / norm for t, w in top} if norm else {}
+    return {"norms": norms, "truncated": truncated}
+
+def _score(query_vec, doc_ids, tfidf_docs, norms):
+    q_norm = math.sqrt(sum(w ** 2 for w in query_vec.values()))
+    scores = {}
+    if not q_norm:
+        return scores
+    for doc_id in doc_ids:
+        vec = tfidf_docs[doc_id]
+        dot = sum(w * vec.get(t, 0.0) for t, w in query_vec.items())
+        if dot and norms[doc_id]:
+            scores[doc_id] = dot / (q_norm * norms[doc_id])
+    return scores
+
+def expand_query(query_vec, feedback_docs, cache, n_expansion=10, alpha=1.0, beta=0.75):
+    """
+    Rocchio: q' = alpha * q/|q| + beta * rata-rata vektor terpotong dokumen feedback.
+    Hanya term query asli ditambah n_expansion term baru terbaik yang dipertahankan.
+    """
+    q_norm = math.sqrt(sum(w ** 2 for w in query_vec.values()))
+    expanded = {t: alpha * w / q_norm for t, w in query_vec.items()} if q_norm else {}
+    centroid = {}
+    for doc_id in feedback_docs:
+        for t, w in cache["truncated"][doc_id].items():
+            centroid[t] = centroid.get(t, 0.0) + w / len(feedback_docs)
+
+    new_terms = heapq.nlargest(n_expansion, (t for t in centroid if t not in expanded),
+                               key=centroid.get)
+    for t in list(expanded) + new_terms:
+        expanded[t] = expanded.get(t, 0.0) + beta * centroid.get(t, 0.0)
+    return expanded
+
+def rocchio_retrieve(query, tfidf_docs, idf, cache, top_k=5, m=3, n_expansion=10,
+                     alpha=1.0, beta=0.75, n_candidates=100):
+    """
+    Retrieve dengan pseudo-relevance feedback.
+    Mengembalikan (hasil [(doc_id, skor), ...], term ekspansi).
+    """
+    query_vec = vectorize_query(query, idf)
+    first = _score(query_vec, tfidf_docs.keys(), tfidf_docs, cache["norms"])
+    candidates = heapq.nlargest(n_candidates, first, key=first.get)
+    if not candidates:
+        return [], []
+
+    expanded = expand_query(query_vec, candidates[:m], cache, n_expansion, alpha, beta)
+    second = _score(expanded, candidates, tfidf_docs, cache["norms"])
+    ranked = sorted(second.items(), key=lambda x: x[1], reverse=True)
+    return ranked[:top_k], [t for t in expanded if t not in query_vec]
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    tfidf_docs, idf = compute_tf_idf(docs)
+    cache = build_feedback_cache(tfidf_docs)
+
+    file_list = set(docs.keys())
+    queries = {
+        "informas sistem": set(f for f in file_list if "Pengenalan" in f or "Vector Space Model" in f),
+        "dokumen query": set(f for f in file_list if "Preprocessing" in f or "Boolean Model" in f),
+        "model boolean": set(f for f in file_list if "Boolean Model" in f),
+    }
+    k = 5
+
+    print(f"{'Query':20} | {'Mode':8} | P@{k}  | MAP@{k} | nDCG@{k} | ms")
+    print("-" * 70)
+    for q, gold in queries.items():
+        start = time.perf_counter()
+        query_vec = vectorize_query(q, idf)
+        scores = _score(query_vec, tfidf_docs.keys(), tfidf_docs, cache["norms"])
+        base = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+        base_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        prf, terms = rocchio_retrieve(q, tfidf_docs, idf, cache, top_k=k)
+        prf_ms = (time.perf_counter() - start) * 1000
+
+        for mode, res, ms in (("baseline", base, base_ms), ("rocchio", prf, prf_ms)):
+            print(f"{q:20} | {mode:8} | {precision_at_k(res, gold, k):.2f} | "
+                  f"{average_precision(res, gold, k):6.2f} | {ndcg_at_k(res, gold, k):7.2f} | {ms:.3f}")
+        print(f"{'':20}   ekspansi: {', '.join(terms[:6])}")
@@ -0,0 +1,150 @@
+import re
+import math
+import heapq
+from collections import Counter
+
+from boolean_ir import eval_boolean_tokens
+from lexicon import build_lexicon, expand_wildcard
+from preprocess import clean_text, tokenize, remove_stopwords, simple_stem
+from vsm_ir import load_processed_docs, precision_at_k, average_precision, ndcg_at_k
+
+
+#  DOKUMEN MULTI-FIELD
+#  Field "title" diambil dari nama file, field "body" dari token dokumen.
+#  Judul dinormalisasi sama seperti body di preprocess.py (clean, stopword,
+#  stem) agar satu kata berada di postings yang sama untuk kedua field.
+#  Satu inverted index untuk semua field: posting menyimpan tf per field
+#  {term: {doc_id: [tf_title, tf_body]}}, jadi index tidak diduplikasi per field.
+
+FIELDS = ("title", "body")
+DEFAULT_WEIGHTS = {"title": 3.0, "body": 1.0}
+DEFAULT_B = {"title": 0.5, "body": 0.75}
+
+def normalize_terms(text, stemmer=simple_stem):
+    """clean_text, stopword removal, lalu stem: sama seperti token body."""
+    tokens = remove_stopwords(tokenize(clean_text(text)))
+    return [stemmer(t) for t in tokens] if stemmer else tokens
+
+def title_tokens(doc_id, stemmer=simple_stem):
+    """Token judul dari nama file, mis. "CLEAN_Naive Bayes.txt" -> [naive, baye]."""
+    name = re.sub(r"\.txt$", "", doc_id)
+    name = re.sub(r"^CLEAN_", "", name)
+    return normalize_terms(name, stemmer)
+
+def build_field_index(docs, stemmer=simple_stem):
+    """
+    Membangun index multi-field dari {doc_id: [token body, ...]}.
+    Mengembalikan dict berisi postings, panjang per field, dan rata-ratanya.
+    stemmer disimpan di index dan dipakai untuk term query.
+    """
+    postings = {}
+    lengths = {}
+    for doc_id, body in docs.items():
+        fields = {"title": title_tokens(doc_id, stemmer), "body": body}
+        lengths[doc_id] = [len(fields[f]) for f in FIELDS]
+        for i, f in enumerate(FIELDS):
+            for term, tf in Counter(fields[f]).items():
+                postings.setdefault(term, {}).setdefault(doc_id, [0] * len(FIELDS))[i] = tf
+
+    N = len(docs)
+    avg_len = [sum(l[i] for l in lengths.values()) / N if N else 0.0 for i in range(len(FIELDS))]
+    idf = {t: math.log(1 + (N - len(p) + 0.5) / (len(p) + 0.5)) for t, p in postings.items()}
+    return {"postings": postings, "lengths": lengths, "avg_len": avg_len, "idf": idf,
+            "doc_ids": list(docs.keys()), "lexicon": build_lexicon(postings), "stemmer": stemmer}
+
+
+#  BM25F
+
+def bm25f_retrieve(query, index, top_k=5, weights=None, b=None, k1=1.2):
+    """
+    BM25F: tf tiap field dinormalisasi panjang field lalu dijumlah berbobot,
+    baru kemudian disaturasi sekali (bukan BM25 per field lalu dijumlah).
+    Skor dihitung dalam satu pass atas postings gabungan tiap term query.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    b = b or DEFAULT_B
+    w = [weights.get(f, 0.0) for f in FIELDS]
+    bf = [b.get(f, 0.75) for f in FIELDS]
+    avg_len = index["avg_len"]
+
+    scores = {}
+    for term in normalize_terms(query, index["stemmer"]):
+        plist = index["postings"].get(term)
+        if not plist:
+            continue
+        idf = index["idf"][term]
+        for doc_id, tfs in plist.items():
+            lens = index["lengths"][doc_id]
+            tf = 0.0
+            for i in range(len(FIELDS)):
+                if tfs[i] and avg_len[i]:
+                    tf += w[i] * tfs[i] / (1 - bf[i] + bf[i] * lens[i] / avg_len[i])
+            if tf:
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf / (k1 + tf)
+    return heapq.nlargest(top_k, scores.items(), key=lambda x: x[1])
+
+
+#  BOOLEAN DENGAN FIELD
+
+def tokenize_field_query(query):
+    """Seperti tokenize_boolean_query, tetapi "field:term" tetap satu token."""
+    return re.findall(r'[\w*]+:[\w*]+|[\w*]+|\(|\)', query.upper())
+
+def field_boolean_retrieve(query, index, stemmer=None):
+    """
+    Boolean retrieval dengan pembatasan field, mis. "title:boolean AND sistem".
+    Term tanpa prefix field cocok di field mana pun. Term wildcard seperti
+    "title:inform*" diekspansi lewat lexicon index. Tanpa stemmer, stemmer
+    index yang dipakai.
+    """
+    stemmer = stemmer or index["stemmer"]
+    all_docs = set(index["doc_ids"])
+
+    def get_docs(token):
+        token = token.lower()
+        field, _, term = token.rpartition(":")
+        if field and field not in FIELDS:
+            raise ValueError(f"Field tidak dikenal: {field}")
+        if "*" in term:
+            terms = expand_wildcard(index["lexicon"], term)
+        else:
+            terms = [stemmer(term) if stemmer else term]
+        docs = set()
+        for t in terms:
+            plist = index["postings"].get(t, {})
+            if not field:
+                docs |= set(plist)
+            else:
+                i = FIELDS.index(field)
+                docs |= {doc_id for doc_id, tfs in plist.items() if tfs[i]}
+        return docs
+
+    result = eval_boolean_tokens(tokenize_field_query(query), get_docs, lambda docs: all_docs - docs)
+    return sorted(result) if result else []
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    index = build_field_index(docs)
+    for q in ("title:boolean", "title:boolean AND dokumen", "title:model AND NOT title:boolean",
+              "body:evaluasi", "title:evaluasi", "title:pengenal*"):
+        print(f"{q:40} -> {field_boolean_retrieve(q, index)}")
+
+    file_list = set(docs.keys())
+    queries = {
+        "informasi sistem": set(f for f in file_list if "Pengenalan" in f or "Vector Space Model" in f),
+        "dokumen preprocessing": set(f for f in file_list if "Preprocessing" in f),
+        "model boolean": set(f for f in file_list if "Boolean Model" in f),
+    }
+    k = 5
+    print(f"\n{'Query':25} | {'Mode':10} | P@{k}  | MAP@{k} | nDCG@{k}")
+    print("-" * 65)
+    for q, gold in queries.items():
+        for mode, weights in (("body", {"body": 1.0}), ("bm25f", DEFAULT_WEIGHTS)):
+            res = bm25f_retrieve(q, index, top_k=k, weights=weights)
+            print(f"{q:25} | {mode:10} | {precision_at_k(res, gold, k):.2f} | "
+                  f"{average_precision(res, gold, k):6.2f} | {ndcg_at_k(res, gold, k):7.2f}")
@@ -0,0 +1,211 @@
+import math
+import heapq
+import time
+import numpy as np
+from collections import Counter
+
+from boolean_ir import build_inverted_index, tokenize_boolean_query, eval_boolean_tokens
+from doc_stats import load_doc_stats
+from lexicon import build_lexicon, expand_wildcard
+from preprocess import simple_stem, STOPWORDS
+from vsm_ir import load_processed_docs, compute_tf_idf, vectorize_query
+
+
+#  BITMAP INDEX
+#  Setiap dokumen diberi nomor urut; postings term disimpan sebagai bitmap
+#  (int Python) sehingga AND/OR/NOT cukup operasi bit.
+
+def build_bitmap_index(inverted_index, doc_ids):
+    """
+    Mengubah inverted index {term: set(doc_id)} menjadi {term: bitmap}.
+    Bit ke-i menyala jika dokumen doc_ids[i] mengandung term.
+    """
+    doc_pos = {d: i for i, d in enumerate(doc_ids)}
+    bitmaps = {}
+    for term, postings in inverted_index.items():
+        # bit di-set di array lalu dikemas sekali; bits |= 1 << i per dokumen
+        # membuat int baru sepanjang N bit di setiap langkah
+        flags = np.zeros(len(doc_ids), dtype=np.uint8)
+        flags[[doc_pos[d] for d in postings]] = 1
+        bitmaps[term] = int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+    return bitmaps
+
+def boolean_bitmap(query, bitmap_index, n_docs, stemmer=None, stop_words=None, lexicon=None):
+    """
+    Mengevaluasi query Boolean menjadi bitmap kandidat dokumen.
+    Term wildcard diekspansi lewat lexicon dan bitmap-nya di-OR.
+    """
+    all_bits = (1 << n_docs) - 1
+
+    def get_docs(term):
+        term = term.lower()
+        if lexicon and "*" in term:
+            bits = 0
+            for t in expand_wildcard(lexicon, term):
+                bits |= bitmap_index[t]
+            return bits
+        if stop_words and term in stop_words:
+            return 0
+        if stemmer:
+            term = stemmer(term)
+        return bitmap_index.get(term, 0)
+
+    result = eval_boolean_tokens(tokenize_boolean_query(query), get_docs,
+                                 lambda bits: all_bits & ~bits)
+    return result or 0
+
+def iter_bits(bits):
+    """
+    Menghasilkan posisi bit yang menyala (urut naik) dalam satu pass linear:
+    bitmap diubah ke byte, dibuka dengan np.unpackbits, lalu np.flatnonzero.
+    """
+    if not bits:
+        return
+    raw = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    yield from np.flatnonzero(np.unpackbits(raw, bitorder="little")).tolist()
+
+def positive_query_terms(query, stemmer=None, stop_words=None, lexicon=None):
+    """
+    Term query yang dipakai untuk skoring: operator dan term setelah NOT dibuang,
+    term wildcard diganti dengan hasil ekspansinya.
+    """
+    terms = []
+    negate_next = False
+    for tok in tokenize_boolean_query(query):
+        if tok in ("AND", "OR", "(", ")"):
+            continue
+        if tok == "NOT":
+            negate_next = True
+            continue
+        term = tok.lower()
+        if lexicon and "*" in term:
+            if not negate_next:
+                terms.extend(expand_wildcard(lexicon, term))
+        elif not negate_next and not (stop_words and term in stop_words):
+            terms.append(stemmer(term) if stemmer else term)
+        negate_next = False
+    return terms
+
+
+#  MODEL GABUNGAN (Boolean + VSM/BM25)
+
+def build_filtered_model(docs, doc_stats=None, k1=1.5, b=0.75, stemmer=simple_stem, stop_words=STOPWORDS):
+    """
+    Menyiapkan semua struktur untuk filtered ranking dalam satu kali build.
+    Parameter:
+        docs: dict {doc_id: [token1, token2, ...]}
+        doc_stats: statistik dokumen dari doc_stats.py (opsional), dipakai
+                   ulang untuk max_tf, norm, dan panjang dokumen
+        stemmer, stop_words: normalisasi yang dipakai saat preprocessing
+                   korpus; disimpan di model dan diterapkan ke term query
+    """
+    doc_ids = list(docs.keys())
+    inverted = build_inverted_index(docs)
+    tfidf_docs, idf = compute_tf_idf(docs, doc_stats)
+    tf_docs = {d: Counter(tokens) for d, tokens in docs.items()}
+    if doc_stats:
+        norms = {d: doc_stats[d]["norms"]["tfidf"] for d in doc_ids}
+        doc_len = {d: doc_stats[d]["length"] for d in doc_ids}
+    else:
+        norms = {d: math.sqrt(sum(w ** 2 for w in vec.values())) for d, vec in tfidf_docs.items()}
+        doc_len = {d: len(tokens) for d, tokens in docs.items()}
+    N = len(docs)
+    avgdl = sum(doc_len.values()) / N if N else 0.0
+    df = Counter(t for tf in tf_docs.values() for t in tf)
+    bm25_idf = {t: math.log(1 + (N - n + 0.5) / (n + 0.5)) for t, n in df.items()}
+
+    return {
+        "doc_ids": doc_ids,
+        "bitmaps": build_bitmap_index(inverted, doc_ids),
+        "lexicon": build_lexicon(inverted),
+        "tfidf_docs": tfidf_docs,
+        "idf": idf,
+        "norms": norms,
+        "tf_docs": tf_docs,
+        "doc_len": doc_len,
+        "avgdl": avgdl,
+        "bm25_idf": bm25_idf,
+        "k1": k1,
+        "b": b,
+        "stemmer": stemmer,
+        "stop_words": stop_words,
+    }
+
+def cosine_score(query_vec, q_norm, doc_id, model):
+    vec = model["tfidf_docs"][doc_id]
+    d_norm = model["norms"][doc_id]
+    if not q_norm or not d_norm:
+        return 0.0
+    dot = sum(w * vec.get(t, 0.0) for t, w in query_vec.items())
+    return dot / (q_norm * d_norm)
+
+def bm25_score(terms, doc_id, model):
+    tf = model["tf_docs"][doc_id]
+    k1, b = model["k1"], model["b"]
+    norm = k1 * (1 - b + b * model["doc_len"][doc_id] / model["avgdl"])
+    score = 0.0
+    for t in terms:
+        f = tf.get(t, 0)
+        if f:
+            score += model["bm25_idf"][t] * f * (k1 + 1) / (f + norm)
+    return score
+
+def filtered_retrieve(query, model, top_k=5, scorer="cosine", stemmer=None, stop_words=None):
+    """
+    Filtered ranking: query Boolean dievaluasi sebagai bitmap kandidat, lalu
+    hanya dokumen yang lolos filter yang diberi skor (cosine atau bm25).
+    Hasil berupa [(doc_id, skor), ...] seperti retrieve().
+    Tanpa stemmer/stop_words, normalisasi yang tersimpan di model yang dipakai.
+    """
+    stemmer = stemmer or model["stemmer"]
+    stop_words = stop_words if stop_words is not None else model["stop_words"]
+    doc_ids = model["doc_ids"]
+    lexicon = model["lexicon"]
+    candidates = boolean_bitmap(query, model["bitmaps"], len(doc_ids), stemmer, stop_words, lexicon)
+    if not candidates:
+        return []
+
+    terms = positive_query_terms(query, stemmer, stop_words, lexicon)
+    if scorer == "cosine":
+        query_vec = vectorize_query(" ".join(terms), model["idf"])
+        q_norm = math.sqrt(sum(w ** 2 for w in query_vec.values()))
+        score_fn = lambda d: cosine_score(query_vec, q_norm, d, model)
+    elif scorer == "bm25":
+        score_fn = lambda d: bm25_score(terms, d, model)
+    else:
+        raise ValueError(f"Scorer tidak dikenal: {scorer}")
+
+    scored = ((doc_ids[i], score_fn(doc_ids[i])) for i in iter_bits(candidates))
+    return heapq.nlargest(top_k, scored, key=lambda x: x[1])
+
+
+#  DEMO
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    model = build_filtered_model(docs, load_doc_stats(data_path, docs))
+    queries = [
+        "informasi and sistem",
+        "dokumen or query",
+        "(informasi or sistem) and not evaluasi",
+    ]
+
+    for scorer in ("cosine", "bm25"):
+        print(f"\n=== Filtered ranking ({scorer}) ===")
+        for q in queries:
+            start = time.perf_counter()
+            results = filtered_retrieve(q, model, top_k=5, scorer=scorer)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"\nQUERY: {q}  ({elapsed:.3f} ms)")
+            for rank, (doc, score) in enumerate(results, 1):
+                print(f"{rank:2d}. {doc:<30} | skor: {score:.4f}")
+
+        # dokumen yang di-NOT tidak boleh muncul di hasil
+        excluded = {model["doc_ids"][i] for i in iter_bits(
+            boolean_bitmap("evaluasi", model["bitmaps"], len(model["doc_ids"]), model["stemmer"]))}
+        results = filtered_retrieve(queries[2], model, top_k=len(docs), scorer=scorer)
+        assert excluded and not excluded & {d for d, _ in results}, "dokumen NOT muncul di hasil"
@@ -0,0 +1,134 @@
+import time
+from collections import defaultdict
+
+
+#  FUZZY TERM INDEX (symmetric delete)
+#  Saat build, setiap term disimpan di bawah semua varian hasil menghapus
+#  0..max_distance karakter dari prefix-nya. Saat query, varian hapus dari term
+#  query dicocokkan ke tabel ini, lalu kandidat diverifikasi dengan edit
+#  distance. Tidak ada perbandingan dengan seluruh vocabulary.
+
+def deletes(word, max_distance):
+    """Semua string hasil menghapus 0..max_distance karakter dari word."""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for w in frontier:
+            for i in range(len(w)):
+                next_frontier.add(w[:i] + w[i + 1:])
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+def edit_distance(a, b, max_distance):
+    """
+    Levenshtein distance dengan batas: berhenti lebih awal dan mengembalikan
+    max_distance + 1 jika jarak pasti melebihi batas.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        curr = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            curr[j] = min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + (ca != cb))
+        if min(curr) > max_distance:
+            return max_distance + 1
+        prev = curr
+    return prev[-1]
+
+def allowed_distance(term, max_distance):
+    """
+    Batas edit distance sesuai panjang term: term pendek punya terlalu banyak
+    tetangga dekat, jadi koreksinya lebih ketat.
+        <= 2 karakter : 0 (tidak dikoreksi)
+        <= 4 karakter : 1
+        lainnya       : max_distance
+    """
+    if len(term) <= 2:
+        return 0
+    if len(term) <= 4:
+        return min(1, max_distance)
+    return max_distance
+
+def build_fuzzy_index(df, max_distance=2, prefix_length=7):
+    """
+    Membangun fuzzy index dari {term: df}.
+    Hanya prefix_length karakter pertama yang di-generate variannya agar
+    ukuran tabel tidak meledak untuk term panjang.
+    """
+    table = defaultdict(list)
+    for term in df:
+        for variant in deletes(term[:prefix_length], max_distance):
+            table[variant].append(term)
+    return {
+        "table": dict(table),
+        "df": dict(df),
+        "max_distance": max_distance,
+        "prefix_length": prefix_length,
+    }
+
+def suggest(fuzzy_index, term, max_distance=None):
+    """
+    Kandidat term in-vocabulary terdekat, urut (jarak, -df).
+    Tanpa max_distance, batasnya mengikuti panjang term (allowed_distance).
+    Hasil berupa [(term, jarak), ...].
+    """
+    if max_distance is None:
+        max_distance = allowed_distance(term, fuzzy_index["max_distance"])
+    df = fuzzy_index["df"]
+    if term in df:
+        return [(term, 0)]
+    if max_distance == 0:
+        return []
+
+    table = fuzzy_index["table"]
+    candidates = set()
+    for variant in deletes(term[:fuzzy_index["prefix_length"]], max_distance):
+        candidates.update(table.get(variant, ()))
+
+    scored = []
+    for cand in candidates:
+        d = edit_distance(term, cand, max_distance)
+        if d <= max_distance:
+            scored.append((d, -df[cand], cand))
+    scored.sort()
+    return [(cand, d) for d, _, cand in scored]
+
+def resolve_term(fuzzy_index, term):
+    """Term in-vocabulary terdekat untuk term query, atau None jika tidak ada."""
+    candidates = suggest(fuzzy_index, term)
+    return candidates[0][0] if candidates else None
+
+
+if __name__ == "__main__":
+    from boolean_ir import build_inverted_index, boolean_retrieve
+    from vsm_ir import load_processed_docs, compute_tf_idf, retrieve
+
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    inverted = build_inverted_index(docs)
+    start = time.perf_counter()
+    fuzzy_index = build_fuzzy_index({t: len(d) for t, d in inverted.items()})
+    print(f"Fuzzy index: {len(inverted)} term, {len(fuzzy_index['table'])} varian "
+          f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    for term in ("infromas", "dokumne", "sistme", "evalusi", "qeury", "xyz", "a"):
+        start = time.perf_counter()
+        best = resolve_term(fuzzy_index, term)
+        elapsed = (time.perf_counter() - start) * 1e6
+        print(f"{term:10} -> {best}  ({elapsed:.1f} us)")
+
+    q = "dokumne AND sistme"
+    print(f"\nBoolean: {q}")
+    print(boolean_retrieve(q, inverted, list(docs.keys()), fuzzy_index=fuzzy_index))
+
+    tfidf_docs, idf = compute_tf_idf(docs)
+    q = "infromas sistme"
+    print(f"\nVSM: {q}")
+    for doc, score in retrieve(q, tfidf_docs, idf, top_k=3, fuzzy_index=fuzzy_index):
+        print(f"  {doc:<30} | skor: {score:.4f}")
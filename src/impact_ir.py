@@ -0,0 +1,168 @@
+import math
+import time
+import heapq
+import random
+
+from vsm_ir import load_processed_docs, compute_tf_idf, vectorize_query, retrieve
+
+
+#  IMPACT-ORDERED INDEX
+#  Impact posting = kontribusi dokumen ke cosine untuk query bernorma 1,
+#  yaitu w(t,d) / |d|. Postings tiap term diurutkan dari impact terbesar dan
+#  dikelompokkan per level kuantisasi (segmen). Query diproses segmen demi
+#  segmen (score-at-a-time) dari kontribusi terbesar.
+
+def build_impact_index(tfidf_docs, levels=256):
+    """
+    Membangun impact index dari tfidf_docs {doc_id: {term: bobot}}.
+    Setiap term: list posting (doc_pos, impact) terurut menurun, dan
+    segmen (awal, akhir, impact maksimum) untuk tiap level kuantisasi.
+    """
+    doc_ids = list(tfidf_docs.keys())
+    norms = [math.sqrt(sum(w ** 2 for w in tfidf_docs[d].values())) for d in doc_ids]
+    raw = {}
+    for pos, doc_id in enumerate(doc_ids):
+        if not norms[pos]:
+            continue
+        for term, w in tfidf_docs[doc_id].items():
+            if w > 0:
+                raw.setdefault(term, []).append((pos, w / norms[pos]))
+
+    max_impact = max((imp for plist in raw.values() for _, imp in plist), default=0.0)
+    scale = max_impact / (levels - 1) if max_impact else 1.0
+
+    postings, segments = {}, {}
+    for term, plist in raw.items():
+        plist.sort(key=lambda x: (-x[1], x[0]))
+        segs = []
+        start = 0
+        for i in range(1, len(plist) + 1):
+            if i == len(plist) or int(plist[i][1] / scale) != int(plist[start][1] / scale):
+                segs.append((start, i, plist[start][1]))
+                start = i
+        postings[term] = plist
+        segments[term] = segs
+
+    return {
+        "doc_ids": doc_ids,
+        "norms": norms,
+        "tfidf_docs": tfidf_docs,
+        "postings": postings,
+        "segments": segments,
+        "levels": levels,
+    }
+
+def _top_k_safe(acc, k, remaining):
+    """
+    True jika sisa kontribusi (remaining) tidak bisa lagi mengubah himpunan top-k:
+    dokumen di luar top-k maupun dokumen yang belum terlihat tidak bisa
+    melampaui skor ke-k.
+    """
+    if len(acc) < k:
+        return False
+    top = heapq.nlargest(k + 1, acc.values())
+    kth = top[k - 1]
+    outside = top[k] if len(top) > k else 0.0
+    return outside + remaining <= kth and remaining <= kth
+
+def impact_retrieve(query, idf, index, top_k=5, budget_ms=None, stats=None):
+    """
+    Score-at-a-time retrieval di atas impact index.
+    Berhenti saat sisa impact tidak bisa mengubah top-k (rank-safe), atau saat
+    budget_ms terlampaui (mode anytime, hasil bisa berupa aproksimasi).
+    Skor akhir top-k dihitung ulang secara exact sehingga sama dengan retrieve().
+    """
+    start = time.perf_counter()
+    full_vec = vectorize_query(query, idf)
+    q_norm = math.sqrt(sum(w ** 2 for w in full_vec.values()))
+    query_vec = {t: w for t, w in full_vec.items() if w and t in index["postings"]}
+    doc_ids = index["doc_ids"]
+
+    acc = {}
+    processed = 0
+    if q_norm:
+        weights = {t: w / q_norm for t, w in query_vec.items()}
+        # heap segmen berikutnya per term, urut kontribusi maksimum
+        heap = [(-weights[t] * index["segments"][t][0][2], t, 0) for t in weights]
+        heapq.heapify(heap)
+        bound = {t: weights[t] * index["segments"][t][0][2] for t in weights}
+        remaining = sum(bound.values())
+
+        while heap:
+            _, term, seg_no = heapq.heappop(heap)
+            seg_start, seg_end, _ = index["segments"][term][seg_no]
+            w_q = weights[term]
+            for pos, impact in index["postings"][term][seg_start:seg_end]:
+                acc[pos] = acc.get(pos, 0.0) + w_q * impact
+            processed += seg_end - seg_start
+
+            segs = index["segments"][term]
+            new_bound = w_q * segs[seg_no + 1][2] if seg_no + 1 < len(segs) else 0.0
+            remaining += new_bound - bound[term]
+            bound[term] = new_bound
+            if seg_no + 1 < len(segs):
+                heapq.heappush(heap, (-new_bound, term, seg_no + 1))
+
+            if _top_k_safe(acc, top_k, remaining):
+                break
+            if budget_ms is not None and (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+
+    # rescoring exact hanya untuk kandidat top-k, lalu isi dengan dokumen skor 0
+    # (urutan dokumen sama seperti retrieve) jika kandidat kurang dari top_k
+    candidates = heapq.nlargest(top_k, acc, key=acc.get)
+    results = []
+    for pos in candidates:
+        vec = index["tfidf_docs"][doc_ids[pos]]
+        dot = sum(w * vec.get(t, 0.0) for t, w in query_vec.items())
+        results.append((doc_ids[pos], dot / (q_norm * index["norms"][pos])))
+    results.sort(key=lambda x: x[1], reverse=True)
+    if len(results) < top_k:
+        chosen = set(candidates)
+        results += [(doc_ids[p], 0.0) for p in range(len(doc_ids)) if p not in chosen][:top_k - len(results)]
+
+    if stats is not None:
+        stats["postings_processed"] = processed
+        stats["postings_total"] = sum(len(index["postings"][t]) for t in query_vec)
+    return results
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    # korpus sintetis agar postings cukup panjang untuk early termination
+    rng = random.Random(0)
+    sources = list(docs.values())
+    big = {f"synthetic_{i}.txt": rng.choices(rng.choice(sources), k=rng.randint(50, 300))
+           for i in range(5000)}
+    tfidf_docs, idf = compute_tf_idf(big)
+    index = build_impact_index(tfidf_docs)
+
+    vocab = sorted(idf, key=idf.get)[:1000]
+    queries = [" ".join(rng.sample(vocab, rng.randint(1, 3))) for _ in range(50)]
+    k = 10
+
+    for label, budget in (("rank-safe", None), ("anytime 0.5 ms", 0.5)):
+        agree, processed, total, t_saat, t_full = 0, 0, 0, 0.0, 0.0
+        for q in queries:
+            start = time.perf_counter()
+            exact = retrieve(q, tfidf_docs, idf, top_k=k)
+            t_full += time.perf_counter() - start
+
+            stats = {}
+            start = time.perf_counter()
+            fast = impact_retrieve(q, idf, index, top_k=k, budget_ms=budget, stats=stats)
+            t_saat += time.perf_counter() - start
+
+            exact_scores = [round(s, 9) for _, s in exact]
+            fast_scores = [round(s, 9) for _, s in fast]
+            agree += exact_scores == fast_scores
+            processed += stats["postings_processed"]
+            total += stats["postings_total"]
+        n = len(queries)
+        print(f"{label:15} | top-{k} sama dengan retrieve: {agree}/{n} | "
+              f"postings diproses: {processed / total * 100:5.1f}% | "
+              f"{t_saat / n * 1000:.3f} ms/query (retrieve: {t_full / n * 1000:.3f} ms)")
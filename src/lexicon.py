@@ -0,0 +1,71 @@
+import time
+import heapq
+import fnmatch
+from bisect import bisect_left
+
+
+#  LEXICON TERURUT
+#  Semua term disimpan dalam array terurut beserta df-nya. Term dengan prefix
+#  yang sama selalu berdampingan, jadi cukup dua binary search per prefix.
+
+def build_lexicon(inverted_index):
+    """
+    Membangun lexicon dari inverted index {term: set(doc_id)}.
+    """
+    terms = sorted(inverted_index.keys())
+    return {"terms": terms, "df": [len(inverted_index[t]) for t in terms]}
+
+def prefix_range(lexicon, prefix):
+    """Rentang indeks [lo, hi) term yang diawali prefix, O(log V)."""
+    terms = lexicon["terms"]
+    lo = bisect_left(terms, prefix)
+    hi = bisect_left(terms, prefix + "\uffff", lo)
+    return lo, hi
+
+def expand_wildcard(lexicon, pattern):
+    """
+    Ekspansi term wildcard seperti "inform*" atau "inf*si".
+    Bagian sebelum '*' pertama dipakai sebagai prefix, sisanya dicocokkan
+    dengan fnmatch hanya pada term di rentang prefix tersebut.
+    """
+    pattern = pattern.lower()
+    prefix = pattern.split("*", 1)[0]
+    lo, hi = prefix_range(lexicon, prefix)
+    candidates = lexicon["terms"][lo:hi]
+    if pattern == prefix + "*":
+        return candidates
+    return [t for t in candidates if fnmatch.fnmatchcase(t, pattern)]
+
+def complete(lexicon, prefix, n=10):
+    """
+    Autocomplete: n term dengan df tertinggi yang diawali prefix.
+    Hasil berupa [(term, df), ...].
+    """
+    lo, hi = prefix_range(lexicon, prefix.lower())
+    terms, df = lexicon["terms"], lexicon["df"]
+    top = heapq.nlargest(n, range(lo, hi), key=lambda i: (df[i], -i))
+    return [(terms[i], df[i]) for i in top]
+
+
+if __name__ == "__main__":
+    from boolean_ir import build_inverted_index, boolean_retrieve
+    from vsm_ir import load_processed_docs
+
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    inverted = build_inverted_index(docs)
+    lexicon = build_lexicon(inverted)
+    print(f"Lexicon: {len(lexicon['terms'])} term")
+
+    for prefix in ("inf", "sis", "dok", "eval"):
+        start = time.perf_counter()
+        suggestions = complete(lexicon, prefix, n=5)
+        elapsed = (time.perf_counter() - start) * 1e6
+        print(f"{prefix!r:8} -> {suggestions}  ({elapsed:.1f} us)")
+
+    for q in ("inform*", "inform* AND sistem", "eval* OR dok*men"):
+        print(f"\nQUERY: {q}")
+        print(boolean_retrieve(q, inverted, list(docs.keys()), lexicon=lexicon))
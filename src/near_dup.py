@@ -0,0 +1,213 @@
+import os
+import json
+import zlib
+import random
+import numpy as np
+from collections import defaultdict
+
+
+#  DETEKSI NEAR-DUPLICATE (MinHash + LSH)
+#  Dokumen direpresentasikan sebagai himpunan shingle (k token berurutan).
+#  Signature MinHash memperkirakan Jaccard antar dokumen; LSH banding hanya
+#  membandingkan dokumen yang jatuh di bucket yang sama, bukan semua pasangan.
+#  Signature dan bucket LSH disimpan, sehingga dokumen yang di-ingest belakangan
+#  cukup dicocokkan ke bucket yang ada tanpa menghitung ulang seluruh korpus.
+
+NEAR_DUP_FILE = "near_dup.json"
+SIGNATURE_FILE = "near_dup_signatures.npz"
+BUCKET_FILE = "near_dup_buckets.json"
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+def shingles(tokens, k=3):
+    """Hash 32-bit (crc32) dari setiap k-shingle token."""
+    if len(tokens) < k:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {zlib.crc32(" ".join(tokens[i:i + k]).encode("utf-8"))
+            for i in range(len(tokens) - k + 1)}
+
+def make_permutations(num_perm=64, seed=1):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    return a, b
+
+def minhash_signature(shingle_hashes, permutations):
+    """
+    Signature MinHash: untuk tiap permutasi (a*x + b) mod p, ambil nilai minimum.
+    """
+    a, b = permutations
+    if not shingle_hashes:
+        return np.full(len(a), MAX_HASH, dtype=np.uint64)
+    x = np.fromiter(shingle_hashes, dtype=np.uint64)
+    # perkalian uint64 boleh overflow (wrap-around), hasilnya tetap acak untuk hashing
+    hashed = ((np.outer(x, a) + b) % MERSENNE_PRIME) & MAX_HASH
+    return hashed.min(axis=0)
+
+def estimate_jaccard(sig_a, sig_b):
+    return float(np.mean(sig_a == sig_b))
+
+def compute_signatures(docs, num_perm=64, k=3, seed=1):
+    """Signature MinHash untuk {doc_id: [token, ...]}."""
+    perms = make_permutations(num_perm, seed)
+    return {doc_id: minhash_signature(shingles(tokens, k), perms) for doc_id, tokens in docs.items()}
+
+def _band_keys(sig, bands):
+    rows = len(sig) // bands
+    return [sig[band * rows:(band + 1) * rows].tobytes().hex() for band in range(bands)]
+
+def _find(parent, d):
+    while parent[d] != d:
+        parent[d] = parent[parent[d]]
+        d = parent[d]
+    return d
+
+def build_lsh_index(num_perm=64, k=3, seed=1, bands=16, threshold=0.8):
+    """Indeks LSH kosong; dokumen ditambahkan dengan add_to_lsh_index."""
+    return {
+        "params": {"num_perm": num_perm, "k": k, "seed": seed, "bands": bands, "threshold": threshold},
+        "signatures": {},
+        "buckets": [defaultdict(list) for _ in range(bands)],
+        "parent": {},
+    }
+
+def add_signatures(index, signatures):
+    """
+    Menambahkan {doc_id: signature} ke indeks. Setiap dokumen baru hanya
+    dibandingkan dengan dokumen di bucket yang sama (band demi band). Setiap
+    anggota bucket dari cluster lain diverifikasi dengan estimasi Jaccard >=
+    threshold; begitu ter-union, sisa bucket itu dilewati.
+    """
+    params, parent = index["params"], index["parent"]
+    for doc_id in sorted(signatures):
+        sig = signatures[doc_id]
+        index["signatures"][doc_id] = sig
+        parent.setdefault(doc_id, doc_id)
+        for bucket, key in zip(index["buckets"], _band_keys(sig, params["bands"])):
+            members = bucket[key]
+            for other in members:
+                ra, rb = _find(parent, doc_id), _find(parent, other)
+                if ra != rb and estimate_jaccard(sig, index["signatures"][other]) >= params["threshold"]:
+                    parent[max(ra, rb)] = min(ra, rb)
+                    break
+            members.append(doc_id)
+    return index
+
+def add_to_lsh_index(index, docs):
+    """Menghitung signature {doc_id: [token, ...]} dengan parameter indeks lalu menambahkannya."""
+    params = index["params"]
+    return add_signatures(index, compute_signatures(docs, params["num_perm"], params["k"], params["seed"]))
+
+def lsh_clusters(index):
+    """{doc_id: representatif cluster} (representatif = doc_id terkecil)."""
+    return {d: _find(index["parent"], d) for d in sorted(index["parent"])}
+
+def cluster_near_duplicates(signatures, bands=16, threshold=0.8):
+    """
+    LSH banding + union-find atas seluruh signature sekaligus.
+    Mengembalikan {doc_id: representatif cluster} (representatif = doc_id terkecil).
+    """
+    index = build_lsh_index(bands=bands, threshold=threshold)
+    return lsh_clusters(add_signatures(index, signatures))
+
+def save_lsh_index(index, path):
+    """Menyimpan signature (npz), bucket LSH + parameter (json), dan cluster (near_dup.json)."""
+    doc_ids = sorted(index["signatures"])
+    sigs = np.array([index["signatures"][d] for d in doc_ids], dtype=np.uint64)
+    np.savez(os.path.join(path, SIGNATURE_FILE), doc_ids=np.array(doc_ids, dtype=str),
+             signatures=sigs.reshape(len(doc_ids), index["params"]["num_perm"]))
+    with open(os.path.join(path, BUCKET_FILE), "w", encoding="utf-8") as f:
+        json.dump({"params": index["params"], "buckets": index["buckets"]}, f, ensure_ascii=False)
+    save_clusters(lsh_clusters(index), path)
+
+def load_lsh_index(path):
+    """Memuat indeks LSH yang disimpan save_lsh_index; None jika belum pernah dibuat."""
+    sig_path, bucket_path = os.path.join(path, SIGNATURE_FILE), os.path.join(path, BUCKET_FILE)
+    if not (os.path.exists(sig_path) and os.path.exists(bucket_path)):
+        return None
+    with np.load(sig_path) as f:
+        signatures = dict(zip(f["doc_ids"].tolist(), f["signatures"]))
+    with open(bucket_path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    return {
+        "params": saved["params"],
+        "signatures": signatures,
+        "buckets": [defaultdict(list, b) for b in saved["buckets"]],
+        "parent": dict(load_clusters(path) or {d: d for d in signatures}),
+    }
+
+def ingest_near_duplicates(path, docs):
+    """
+    Ingest inkremental: dokumen baru dicocokkan ke indeks LSH yang tersimpan di
+    path, lalu indeks dan near_dup.json diperbarui. Mengembalikan cluster terbaru.
+    """
+    index = load_lsh_index(path) or build_lsh_index()
+    add_to_lsh_index(index, docs)
+    save_lsh_index(index, path)
+    return lsh_clusters(index)
+
+def save_clusters(clusters, path):
+    with open(os.path.join(path, NEAR_DUP_FILE), "w", encoding="utf-8") as f:
+        json.dump(clusters, f, ensure_ascii=False, indent=1)
+
+def load_clusters(path):
+    """Memuat near_dup.json; mengembalikan None jika belum pernah dibuat."""
+    cluster_path = os.path.join(path, NEAR_DUP_FILE)
+    if not os.path.exists(cluster_path):
+        return None
+    with open(cluster_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def collapse_results(ranked, clusters):
+    """Hanya dokumen pertama (skor tertinggi) dari tiap cluster yang dipertahankan."""
+    seen = set()
+    collapsed = []
+    for doc_id, score in ranked:
+        rep = clusters.get(doc_id, doc_id)
+        if rep not in seen:
+            seen.add(rep)
+            collapsed.append((doc_id, score))
+    return collapsed
+
+
+if __name__ == "__main__":
+    import time
+    import tempfile
+    from vsm_ir import load_processed_docs, compute_tf_idf, retrieve
+
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    # tambahkan salinan dokumen yang sedikit diubah untuk simulasi ingest duplikat
+    rng = random.Random(0)
+    ingest = dict(docs)
+    for doc_id, tokens in docs.items():
+        for i in range(2):
+            copy = list(tokens)
+            for _ in range(max(1, len(copy) // 50)):
+                copy[rng.randrange(len(copy))] = "xxx"
+            ingest[f"copy{i}_{doc_id}"] = copy
+
+    start = time.perf_counter()
+    clusters = cluster_near_duplicates(compute_signatures(ingest))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(ingest)} dokumen -> {len(set(clusters.values()))} cluster ({elapsed:.1f} ms)")
+
+    # ingest inkremental: indeks LSH dokumen asli disimpan, salinan ditambahkan belakangan
+    with tempfile.TemporaryDirectory() as tmp:
+        save_lsh_index(add_to_lsh_index(build_lsh_index(), docs), tmp)
+        copies = {d: t for d, t in ingest.items() if d not in docs}
+        start = time.perf_counter()
+        incremental = ingest_near_duplicates(tmp, copies)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Ingest inkremental {len(copies)} salinan -> {len(set(incremental.values()))} cluster "
+              f"({elapsed:.1f} ms), sama dengan batch: {incremental == clusters}")
+
+    tfidf_docs, idf = compute_tf_idf(ingest)
+    q = "informas sistem"
+    for label, cl in (("tanpa collapse", None), ("collapse", clusters)):
+        print(f"\nQUERY: {q} ({label})")
+        for doc, score in retrieve(q, tfidf_docs, idf, top_k=5, clusters=cl):
+            print(f"  {doc:<40} | skor: {score:.4f}")
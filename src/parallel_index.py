@@ -0,0 +1,189 @@
+import os
+import json
+import heapq
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter, defaultdict
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
+
+
+#  PARALLEL INDEX BUILDER (map-reduce)
+#  map   : tiap worker membaca satu batch dokumen, membuat postings parsial
+#          {term: [(doc_id, tf)]} dan menulisnya sebagai run file terurut per term
+#  reduce: run file digabung dengan k-way merge (heapq.merge) bertingkat, paling
+#          banyak fan_in file terbuka sekaligus. Baris run tidak pernah digabung
+#          di memori: postings satu term ditulis bertahap ke file final, jadi
+#          memori puncak dibatasi oleh batch_size x fan_in.
+
+def list_documents(path):
+    return sorted(f for f in os.listdir(path) if f.endswith(".txt"))
+
+def make_batches(items, batch_size):
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+def index_batch(args):
+    """
+    Worker map: membaca batch dokumen dan menulis run file.
+    Mengembalikan (path run file, panjang dokumen per doc_id).
+    """
+    data_path, filenames, run_path = args
+    postings = defaultdict(list)
+    doc_lengths = {}
+    for fn in filenames:
+        with open(os.path.join(data_path, fn), "r", encoding="utf-8") as f:
+            tokens = f.read().split()
+        doc_lengths[fn] = len(tokens)
+        for term, tf in Counter(tokens).items():
+            postings[term].append((fn, tf))
+
+    with open(run_path, "w", encoding="utf-8") as f:
+        for term in sorted(postings):
+            f.write(json.dumps([term, postings[term]]) + "\n")
+    return run_path, doc_lengths
+
+def read_run(run_path):
+    with open(run_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+def merge_group(args):
+    """
+    Satu merge antara: run_paths digabung per term ke out_path. Baris disalin
+    apa adanya (satu term bisa muncul di beberapa baris berurutan). heapq.merge
+    stabil, jadi baris dari run yang lebih awal (dokumen lebih awal) tetap di depan.
+    """
+    run_paths, out_path = args
+    with open(out_path, "w", encoding="utf-8") as out:
+        for term, postings in heapq.merge(*(read_run(p) for p in run_paths), key=lambda x: x[0]):
+            out.write(json.dumps([term, postings]) + "\n")
+    for p in run_paths:
+        os.remove(p)
+    return out_path
+
+def write_postings(out, lines):
+    """
+    Menulis postings satu term secara bertahap dari baris-baris run term itu.
+    Format baris: [term, [[doc_id, tf], ...], df]; df ditulis terakhir agar
+    postings tidak perlu ditampung dulu di memori.
+    """
+    term, df = None, 0
+    for term_, postings in lines:
+        if term is None:
+            term = term_
+            out.write(f"[{json.dumps(term)}, [")
+        for posting in postings:
+            out.write((", " if df else "") + json.dumps(posting))
+            df += 1
+    out.write(f"], {df}]\n")
+
+def merge_runs(run_paths, out_path, fan_in=64, pool=None):
+    """
+    Reduce: merge bertingkat. Selama run lebih banyak dari fan_in, setiap
+    kelompok fan_in run berurutan digabung menjadi satu run (paralel jika
+    pool diberikan). Pass terakhir menulis postings final per term.
+    Mengembalikan jumlah term unik.
+    """
+    run_paths = list(run_paths)
+    level = 0
+    while len(run_paths) > fan_in:
+        base = os.path.dirname(run_paths[0])
+        jobs = [(group, os.path.join(base, f"merge_{level:02d}_{i:05d}.jsonl"))
+                for i, group in enumerate(make_batches(run_paths, fan_in))]
+        run_paths = list(pool.map(merge_group, jobs) if pool else map(merge_group, jobs))
+        level += 1
+
+    n_terms = 0
+    with open(out_path, "w", encoding="utf-8") as out:
+        merged = heapq.merge(*(read_run(p) for p in run_paths), key=lambda x: x[0])
+        for _, lines in groupby(merged, key=lambda x: x[0]):
+            write_postings(out, lines)
+            n_terms += 1
+    return n_terms
+
+def build_index_parallel(data_path, out_dir, n_workers=None, batch_size=100, fan_in=64):
+    """
+    Membangun indeks dari folder dokumen processed secara paralel.
+    fan_in: jumlah maksimum run file yang dibuka sekaligus saat merge.
+    File output di out_dir:
+        postings.jsonl    : [term, [[doc_id, tf], ...], df] terurut per term
+        doc_lengths.json  : {doc_id: jumlah token}
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    filenames = list_documents(data_path)
+    run_dir = tempfile.mkdtemp(prefix="runs_", dir=out_dir)
+    try:
+        jobs = [(data_path, batch, os.path.join(run_dir, f"run_{i:05d}.jsonl"))
+                for i, batch in enumerate(make_batches(filenames, batch_size))]
+
+        doc_lengths = {}
+        run_paths = []
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for run_path, lengths in pool.map(index_batch, jobs):
+                run_paths.append(run_path)
+                doc_lengths.update(lengths)
+            n_terms = merge_runs(run_paths, os.path.join(out_dir, "postings.jsonl"), fan_in, pool)
+
+        with open(os.path.join(out_dir, "doc_lengths.json"), "w", encoding="utf-8") as f:
+            json.dump(doc_lengths, f)
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    return len(doc_lengths), n_terms
+
+def load_index(out_dir):
+    """
+    Memuat indeks hasil build_index_parallel.
+    Mengembalikan (inverted {term: set(doc_id)}, df {term: int}, doc_lengths).
+    """
+    inverted, df = {}, {}
+    with open(os.path.join(out_dir, "postings.jsonl"), "r", encoding="utf-8") as f:
+        for line in f:
+            term, postings, n = json.loads(line)
+            inverted[term] = {doc for doc, _ in postings}
+            df[term] = n
+    with open(os.path.join(out_dir, "doc_lengths.json"), "r", encoding="utf-8") as f:
+        doc_lengths = json.load(f)
+    return inverted, df, doc_lengths
+
+
+def write_synthetic_corpus(data_path, out_path, n_docs, seed=0):
+    """Menulis korpus sintetis (token acak dari dokumen asli) untuk uji skala."""
+    rng = random.Random(seed)
+    sources = []
+    for fn in list_documents(data_path):
+        with open(os.path.join(data_path, fn), "r", encoding="utf-8") as f:
+            sources.append(f.read().split())
+    os.makedirs(out_path, exist_ok=True)
+    for i in range(n_docs):
+        tokens = rng.choices(rng.choice(sources), k=rng.randint(100, 500))
+        with open(os.path.join(out_path, f"synthetic_{i:06d}.txt"), "w", encoding="utf-8") as f:
+            f.write(" ".join(tokens))
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    if not os.path.exists(data_path):
+        exit(f"Folder '{data_path}' tidak ditemukan.")
+
+    n_docs, n_terms = build_index_parallel(data_path, "index", batch_size=2)
+    print(f"Indeks disimpan ke index/: {n_docs} dokumen, {n_terms} term unik")
+
+    # Uji skala: waktu build vs jumlah worker pada korpus sintetis
+    work_dir = tempfile.mkdtemp(prefix="parallel_index_")
+    try:
+        corpus = os.path.join(work_dir, "corpus")
+        write_synthetic_corpus(data_path, corpus, 10000)
+        print(f"\n{'Workers':>7} | {'Waktu (s)':>9} | {'Speedup':>7}")
+        print("-" * 31)
+        base = None
+        for n_workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            build_index_parallel(corpus, os.path.join(work_dir, f"index_{n_workers}"),
+                                 n_workers=n_workers, batch_size=500)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(f"{n_workers:7d} | {elapsed:9.2f} | {base / elapsed:7.2f}x")
+    finally:
+        shutil.rmtree(work_dir)
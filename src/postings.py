@@ -0,0 +1,262 @@
+import random
+import time
+
+from boolean_ir import build_inverted_index, tokenize_boolean_query, eval_boolean_tokens
+from vsm_ir import load_processed_docs
+
+
+#  KOMPRESI POSTINGS
+#  Postings berupa doc id (int) terurut, disimpan sebagai gap dalam blok.
+#  Setiap blok punya skip pointer (first_doc, last_doc, offset, count)
+#  sehingga blok bisa di-decode sendiri atau dilewati seluruhnya.
+
+BLOCK_SIZE = 128
+
+def vbyte_encode(numbers):
+    """Variable-byte: 7 bit data per byte, bit tertinggi menandai byte terakhir."""
+    out = bytearray()
+    for n in numbers:
+        while n >= 128:
+            out.append(n & 0x7F)
+            n >>= 7
+        out.append(n | 0x80)
+    return bytes(out)
+
+def vbyte_decode(data, count=None):
+    numbers = []
+    n, shift = 0, 0
+    for byte in data:
+        if byte & 0x80:
+            numbers.append(n | ((byte & 0x7F) << shift))
+            n, shift = 0, 0
+            if count is not None and len(numbers) == count:
+                break
+        else:
+            n |= byte << shift
+            shift += 7
+    return numbers
+
+def for_encode(numbers):
+    """
+    Frame-of-reference bit packing: satu byte lebar bit, lalu semua angka
+    dipadatkan dengan lebar bit yang sama.
+    """
+    width = max(numbers).bit_length() if numbers else 0
+    acc = 0
+    for i, n in enumerate(numbers):
+        acc |= n << (i * width)
+    n_bytes = (len(numbers) * width + 7) // 8
+    return bytes([width]) + acc.to_bytes(n_bytes, "little")
+
+def for_decode(data, count):
+    width = data[0]
+    if width == 0:
+        return [0] * count
+    n_bytes = (count * width + 7) // 8
+    acc = int.from_bytes(data[1:1 + n_bytes], "little")
+    mask = (1 << width) - 1
+    return [(acc >> (i * width)) & mask for i in range(count)]
+
+CODECS = {
+    "vbyte": (vbyte_encode, vbyte_decode),
+    "for": (for_encode, for_decode),
+}
+
+def compress_postings(doc_ids, codec="vbyte", block_size=BLOCK_SIZE):
+    """
+    Mengompresi list doc id (int) terurut menjadi blok-blok gap.
+    Gap dihitung relatif terhadap first_doc blok, sehingga elemen pertama = 0.
+    """
+    encode, _ = CODECS[codec]
+    data = bytearray()
+    skips = []
+    for start in range(0, len(doc_ids), block_size):
+        block = doc_ids[start:start + block_size]
+        gaps = [0] + [block[i] - block[i - 1] for i in range(1, len(block))]
+        skips.append((block[0], block[-1], len(data), len(block)))
+        data += encode(gaps)
+    return {"codec": codec, "n": len(doc_ids), "skips": skips, "data": bytes(data)}
+
+def decode_block(postings, block_no):
+    _, decode = CODECS[postings["codec"]]
+    first_doc, _, offset, count = postings["skips"][block_no]
+    gaps = decode(memoryview(postings["data"])[offset:], count)
+    docs = []
+    current = first_doc
+    for g in gaps:
+        current += g
+        docs.append(current)
+    return docs
+
+def decode_postings(postings):
+    docs = []
+    for b in range(len(postings["skips"])):
+        docs.extend(decode_block(postings, b))
+    return docs
+
+def postings_size(postings):
+    """Ukuran dalam byte: data terkompresi + skip table (4 int 4-byte per blok)."""
+    return len(postings["data"]) + 16 * len(postings["skips"])
+
+
+#  INTERSECTION DENGAN SKIP BLOK
+
+def intersect_compressed(a, b):
+    """
+    AND dua postings terkompresi. Blok yang rentang [first_doc, last_doc]-nya
+    tidak beririsan dengan blok lawan dilewati tanpa di-decode. Blok yang sedang
+    aktif di tiap sisi di-cache, jadi setiap blok di-decode paling banyak sekali.
+    """
+    skips_a, skips_b = a["skips"], b["skips"]
+    i = j = 0
+    cached_i = cached_j = None
+    result = []
+    while i < len(skips_a) and j < len(skips_b):
+        first_a, last_a = skips_a[i][0], skips_a[i][1]
+        first_b, last_b = skips_b[j][0], skips_b[j][1]
+        if last_a < first_b:
+            i += 1
+            continue
+        if last_b < first_a:
+            j += 1
+            continue
+        if cached_j != j:
+            block_b, cached_j = set(decode_block(b, j)), j
+        if cached_i != i:
+            block_a, cached_i = decode_block(a, i), i
+        result.extend(d for d in block_a if d in block_b)
+        if last_a < last_b:
+            i += 1
+        else:
+            j += 1
+    return result
+
+def intersect_with_list(postings, doc_list):
+    """AND postings terkompresi dengan list doc id terurut (hasil antara)."""
+    skips = postings["skips"]
+    result = []
+    b = 0
+    block = None
+    for d in doc_list:
+        while b < len(skips) and skips[b][1] < d:
+            b += 1
+            block = None
+        if b == len(skips):
+            break
+        if d < skips[b][0]:
+            continue
+        if block is None:
+            block = set(decode_block(postings, b))
+        if d in block:
+            result.append(d)
+    return result
+
+
+#  BOOLEAN RETRIEVAL DI ATAS POSTINGS TERKOMPRESI
+
+class PostingsList:
+    """
+    Operand untuk eval_boolean_tokens: membungkus postings terkompresi atau
+    list doc id terurut hasil operasi sebelumnya.
+    """
+    def __init__(self, compressed=None, docs=None):
+        self.compressed = compressed
+        self.docs = docs
+
+    def to_list(self):
+        if self.docs is None:
+            self.docs = decode_postings(self.compressed) if self.compressed else []
+        return self.docs
+
+    def __and__(self, other):
+        if self.compressed and other.compressed:
+            return PostingsList(docs=intersect_compressed(self.compressed, other.compressed))
+        if self.compressed:
+            return PostingsList(docs=intersect_with_list(self.compressed, other.to_list()))
+        if other.compressed:
+            return PostingsList(docs=intersect_with_list(other.compressed, self.to_list()))
+        return PostingsList(docs=sorted(set(self.to_list()) & set(other.to_list())))
+
+    def __or__(self, other):
+        return PostingsList(docs=sorted(set(self.to_list()) | set(other.to_list())))
+
+def build_compressed_index(inverted_index, doc_ids, codec="vbyte", block_size=BLOCK_SIZE):
+    """
+    Mengubah inverted index {term: set(doc_id)} menjadi {term: postings terkompresi}.
+    Doc id string dipetakan ke posisi di doc_ids.
+    """
+    doc_pos = {d: i for i, d in enumerate(doc_ids)}
+    return {
+        term: compress_postings(sorted(doc_pos[d] for d in docs), codec, block_size)
+        for term, docs in inverted_index.items()
+    }
+
+def compressed_boolean_retrieve(query, compressed_index, doc_ids, stemmer=None, stop_words=None):
+    """
+    Boolean retrieval seperti boolean_retrieve, tetapi AND berjalan langsung
+    di atas postings terkompresi dengan skip blok.
+    """
+    n_docs = len(doc_ids)
+
+    def get_docs(term):
+        term = term.lower()
+        if stop_words and term in stop_words:
+            return PostingsList(docs=[])
+        if stemmer:
+            term = stemmer(term)
+        postings = compressed_index.get(term)
+        return PostingsList(compressed=postings) if postings else PostingsList(docs=[])
+
+    def negate(p):
+        present = set(p.to_list())
+        return PostingsList(docs=[i for i in range(n_docs) if i not in present])
+
+    result = eval_boolean_tokens(tokenize_boolean_query(query), get_docs, negate)
+    return sorted(doc_ids[i] for i in result.to_list()) if result else []
+
+
+#  BENCHMARK CODEC
+
+def benchmark_codecs(postings_lists, repeat=3):
+    """
+    Mengukur byte per posting dan kecepatan decode (postings/detik) per codec.
+    """
+    total = sum(len(p) for p in postings_lists)
+    rows = []
+    for codec in CODECS:
+        compressed = [compress_postings(p, codec) for p in postings_lists if p]
+        size = sum(postings_size(c) for c in compressed)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for c in compressed:
+                decode_postings(c)
+        elapsed = time.perf_counter() - start
+        rows.append((codec, size / total, total * repeat / elapsed if elapsed else 0.0))
+    return rows
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    doc_ids = sorted(docs.keys())
+    inverted = build_inverted_index(docs)
+    cindex = build_compressed_index(inverted, doc_ids)
+    print("QUERY: (informasi or sistem) and not evaluasi")
+    print(compressed_boolean_retrieve("(informasi or sistem) and not evaluasi", cindex, doc_ids))
+
+    # Korpus asli terlalu kecil untuk benchmark, tambahkan postings sintetis
+    rng = random.Random(42)
+    n_docs = 1_000_000
+    synthetic = [sorted(rng.sample(range(n_docs), rng.choice([100, 1000, 10000, 100000])))
+                 for _ in range(40)]
+    real = [sorted(doc_ids.index(d) for d in p) for p in inverted.values()]
+
+    for name, lists in (("korpus", real), ("sintetis", synthetic)):
+        print(f"\nBenchmark codec ({name}, {sum(len(p) for p in lists)} postings)")
+        print(f"{'Codec':8} | {'byte/posting':>12} | {'decode postings/s':>18}")
+        print("-" * 45)
+        for codec, bpp, speed in benchmark_codecs(lists):
+            print(f"{codec:8} | {bpp:12.3f} | {speed:18,.0f}")
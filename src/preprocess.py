@@ -1,7 +1,9 @@
 import os
 import re
-from collections import Counter
-import matplotlib.pyplot as plt
+
+from corpus_store import store_path, create_store, append_documents
+from doc_stats import compute_doc_stats, save_doc_stats, print_doc_stats
+from near_dup import build_lsh_index, add_to_lsh_index, lsh_clusters, save_lsh_index
 
 
 # KONFIGURASI
@@ -72,16 +74,25 @@ def preprocess_all_docs():
         with open(out_path, "w", encoding="utf-8") as f:
             f.write(" ".join(tokens))
 
-        # tampilkan 10 token paling sering
-        counter = Counter(tokens)
-        top10 = counter.most_common(10)
-        print(f"\n {fname}")
-        print(f"Jumlah token: {len(tokens)}")
-        print("10 token paling sering:")
-        for tok, freq in top10:
-            print(f"  {tok:15s} : {freq}")
+    # simpan juga ke corpus store (satu file, dibaca lewat mmap)
+    create_store(store_path(PROCESSED_DIR))
+    append_documents(store_path(PROCESSED_DIR), all_docs)
+
+    # cluster near-duplicate (MinHash + LSH) untuk collapse saat query;
+    # signature & bucket ikut disimpan untuk ingest inkremental (ingest_near_duplicates)
+    lsh_index = add_to_lsh_index(build_lsh_index(), all_docs)
+    save_lsh_index(lsh_index, PROCESSED_DIR)
+    clusters = lsh_clusters(lsh_index)
+    print(f"Near-duplicate: {len(all_docs)} dokumen -> {len(set(clusters.values()))} cluster")
+
+    # statistik per dokumen (max_tf, panjang, term unik, top term, norm)
+    # dihitung sekali di sini dan disimpan untuk dipakai ulang saat indexing
+    doc_stats = compute_doc_stats(all_docs, top_n=10)
+    save_doc_stats(doc_stats, PROCESSED_DIR)
+    print_doc_stats(doc_stats, top_n=10)
 
     # tampilkan dan simpan grafik panjang dokumen
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(8,5))
     plt.bar(doc_lengths.keys(), doc_lengths.values())
     plt.xticks(rotation=45, ha='right')
@@ -0,0 +1,129 @@
+import sys
+import math
+import time
+import random
+import numpy as np
+
+from vsm_ir import load_processed_docs, compute_tf_idf, vectorize_query, retrieve
+
+
+#  PENYIMPANAN BOBOT TERKUANTISASI
+#  Postings per term disimpan sebagai array numpy: posisi dokumen (int32) dan
+#  bobot TF-IDF dalam float32, atau kode 8 bit (uint8) dengan satu skala per
+#  term (bobot ~= kode * skala). Mode 8 bit memakai akumulasi integer.
+
+def build_weight_store(tfidf_docs, bits=None):
+    """
+    Membangun weight store dari tfidf_docs {doc_id: {term: bobot}}.
+    bits=None -> float32, bits=8 -> uint8 dengan skala per term.
+    """
+    doc_ids = list(tfidf_docs.keys())
+    norms = np.array([math.sqrt(sum(w ** 2 for w in tfidf_docs[d].values())) for d in doc_ids],
+                     dtype=np.float32)
+    by_term = {}
+    for pos, doc_id in enumerate(doc_ids):
+        for term, w in tfidf_docs[doc_id].items():
+            if w > 0:
+                by_term.setdefault(term, ([], []))
+                by_term[term][0].append(pos)
+                by_term[term][1].append(w)
+
+    postings = {}
+    for term, (positions, weights) in by_term.items():
+        weights = np.asarray(weights, dtype=np.float64)
+        if bits == 8:
+            scale = weights.max() / 255
+            values = np.round(weights / scale).astype(np.uint8)
+        elif bits is None:
+            scale = 1.0
+            values = weights.astype(np.float32)
+        else:
+            raise ValueError("bits harus None (float32) atau 8")
+        postings[term] = (np.asarray(positions, dtype=np.int32), values, np.float32(scale))
+    return {"doc_ids": doc_ids, "norms": norms, "postings": postings, "bits": bits}
+
+def store_nbytes(store):
+    """Ukuran array bobot + posisi + skala + norm, dalam byte."""
+    total = store["norms"].nbytes
+    for positions, values, scale in store["postings"].values():
+        total += positions.nbytes + values.nbytes + scale.nbytes
+    return total
+
+def dict_nbytes(tfidf_docs):
+    """Perkiraan ukuran tfidf_docs (dict of dict berisi float Python)."""
+    total = sys.getsizeof(tfidf_docs)
+    for vec in tfidf_docs.values():
+        total += sys.getsizeof(vec) + sum(sys.getsizeof(w) for w in vec.values())
+    return total
+
+def quantized_retrieve(query, idf, store, top_k=5):
+    """
+    Cosine retrieval di atas weight store, hasil [(doc_id, skor), ...].
+    Mode 8 bit: skala term digabung ke bobot query, lalu bobot query juga
+    dikuantisasi ke 8 bit sehingga akumulasi skor cukup penjumlahan integer.
+    """
+    query_vec = vectorize_query(query, idf)
+    q_norm = math.sqrt(sum(w ** 2 for w in query_vec.values()))
+    terms = [t for t, w in query_vec.items() if w and t in store["postings"]]
+    doc_ids = store["doc_ids"]
+    if not q_norm or not terms:
+        return [(d, 0.0) for d in doc_ids[:top_k]]
+
+    if store["bits"] == 8:
+        scaled = {t: query_vec[t] * float(store["postings"][t][2]) for t in terms}
+        q_scale = max(scaled.values()) / 255
+        acc = np.zeros(len(doc_ids), dtype=np.int32)
+        for t in terms:
+            positions, codes, _ = store["postings"][t]
+            acc[positions] += int(round(scaled[t] / q_scale)) * codes.astype(np.int32)
+        dots = acc.astype(np.float32) * np.float32(q_scale)
+    else:
+        dots = np.zeros(len(doc_ids), dtype=np.float32)
+        for t in terms:
+            positions, weights, _ = store["postings"][t]
+            dots[positions] += np.float32(query_vec[t]) * weights
+
+    norms = store["norms"]
+    scores = np.divide(dots, np.float32(q_norm) * norms, out=np.zeros_like(dots), where=norms > 0)
+    k = min(top_k, len(doc_ids))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = sorted(top, key=lambda i: (-scores[i], i))
+    return [(doc_ids[i], float(scores[i])) for i in top]
+
+def ndcg_agreement(reference, approx, k):
+    """
+    nDCG@k dari ranking approx, dengan skor float64 referensi sebagai gain.
+    1.0 berarti urutan top-k identik secara efektif.
+    """
+    gain = dict(reference)
+    dcg = sum(gain.get(d, 0.0) / math.log2(i + 1) for i, (d, _) in enumerate(approx[:k], start=1))
+    ideal = sum(s / math.log2(i + 1) for i, (_, s) in enumerate(reference[:k], start=1))
+    return dcg / ideal if ideal > 0 else 1.0
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    rng = random.Random(0)
+    sources = list(docs.values())
+    big = {f"synthetic_{i}.txt": rng.choices(rng.choice(sources), k=rng.randint(50, 300))
+           for i in range(3000)}
+    tfidf_docs, idf = compute_tf_idf(big)
+    vocab = sorted(idf, key=idf.get)[:1000]
+    queries = [" ".join(rng.sample(vocab, rng.randint(1, 3))) for _ in range(50)]
+    k = 10
+    reference = [retrieve(q, tfidf_docs, idf, top_k=k) for q in queries]
+
+    print(f"{'Penyimpanan':14} | {'Ukuran (KB)':>11} | {'nDCG@10 vs float64':>18} | {'ms/query':>8}")
+    print("-" * 62)
+    print(f"{'dict float64':14} | {dict_nbytes(tfidf_docs) / 1024:11.1f} | {1.0:18.4f} | {'-':>8}")
+    for label, bits in (("float32", None), ("uint8", 8)):
+        store = build_weight_store(tfidf_docs, bits)
+        start = time.perf_counter()
+        results = [quantized_retrieve(q, idf, store, top_k=k) for q in queries]
+        ms = (time.perf_counter() - start) * 1000 / len(queries)
+        agreement = sum(ndcg_agreement(r, a, k) for r, a in zip(reference, results)) / len(queries)
+        print(f"{label:14} | {store_nbytes(store) / 1024:11.1f} | {agreement:18.4f} | {ms:8.3f}")
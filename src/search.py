@@ -3,11 +3,15 @@ import re
 import math
 from collections import Counter, defaultdict
 
+from corpus_store import store_path, load_docs_from_store
+
 
 #  LOAD DOKUMEN
 
 def load_processed_docs(path="data/processed"):
     docs = {}
+    if os.path.exists(store_path(path)):
+        return {d: " ".join(tokens) for d, tokens in load_docs_from_store(store_path(path)).items()}
     for filename in os.listdir(path):
         if filename.endswith(".txt"):
             with open(os.path.join(path, filename), "r", encoding="utf-8") as f:
@@ -0,0 +1,204 @@
+import time
+import random
+import threading
+from types import MappingProxyType
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from boolean_ir import build_inverted_index, boolean_retrieve
+from vsm_ir import load_processed_docs, compute_tf_idf, retrieve
+
+
+#  SNAPSHOT INDEKS (single writer, banyak reader)
+#  Setiap generasi indeks adalah snapshot read-only. Writer membangun
+#  generasi berikutnya di luar lock lalu mem-publish-nya dengan satu swap
+#  atomik. Reader memegang snapshot lewat reference counting, sehingga
+#  generasi lama baru dibuang setelah reader terakhir selesai.
+
+def build_snapshot(docs, generation, inverted=None, **extra):
+    """
+    Membangun snapshot read-only dari {doc_id: [token, ...]}.
+    inverted: inverted index {term: set(doc_id)} yang sudah dibangun (opsional).
+    extra: struktur tambahan (mis. tfidf) yang ikut disimpan di snapshot.
+    """
+    if inverted is None:
+        inverted = build_inverted_index(docs)
+    inverted = {t: frozenset(d) for t, d in inverted.items()}
+    snap = {
+        "generation": generation,
+        "docs": MappingProxyType(dict(docs)),
+        "doc_ids": tuple(docs.keys()),
+        "inverted": MappingProxyType(inverted),
+    }
+    snap.update(extra)
+    return MappingProxyType(snap)
+
+def derive_snapshot(old, **extra):
+    """Generasi baru dari snapshot lama dengan struktur tambahan/pengganti."""
+    snap = dict(old)
+    snap["generation"] = old["generation"] + 1
+    snap.update(extra)
+    return MappingProxyType(snap)
+
+class SnapshotManager:
+    """
+    Menyimpan snapshot aktif dan jumlah reader per generasi.
+    on_reclaim(snapshot) dipanggil saat generasi lama tidak lagi dipakai.
+    """
+    def __init__(self, snapshot=None, on_reclaim=None):
+        self._lock = threading.Lock()
+        self._writer_lock = threading.Lock()
+        self._current = snapshot
+        self._refs = {}
+        self._retired = {}
+        self.on_reclaim = on_reclaim
+
+    @property
+    def current(self):
+        return self._current
+
+    def acquire(self):
+        with self._lock:
+            snap = self._current
+            if snap is not None:
+                gen = snap["generation"]
+                self._refs[gen] = self._refs.get(gen, 0) + 1
+            return snap
+
+    def release(self, snap):
+        if snap is None:
+            return
+        reclaimed = None
+        with self._lock:
+            gen = snap["generation"]
+            self._refs[gen] -= 1
+            if self._refs[gen] == 0:
+                del self._refs[gen]
+                reclaimed = self._retired.pop(gen, None)
+        if reclaimed is not None and self.on_reclaim:
+            self.on_reclaim(reclaimed)
+
+    @contextmanager
+    def reading(self):
+        """Context manager reader: snapshot tetap konsisten selama blok berjalan."""
+        snap = self.acquire()
+        try:
+            yield snap
+        finally:
+            self.release(snap)
+
+    def publish(self, snap):
+        """Swap atomik ke snapshot baru; generasi lama dibuang jika tidak ada reader."""
+        reclaimed = None
+        with self._lock:
+            old = self._current
+            self._current = snap
+            if old is not None:
+                gen = old["generation"]
+                if self._refs.get(gen):
+                    self._retired[gen] = old
+                else:
+                    reclaimed = old
+        if reclaimed is not None and self.on_reclaim:
+            self.on_reclaim(reclaimed)
+
+    def update(self, build_fn):
+        """
+        Satu writer pada satu waktu: build_fn(snapshot lama) -> snapshot baru.
+        Build berjalan tanpa memblokir reader.
+        """
+        with self._writer_lock:
+            new = build_fn(self._current)
+            self.publish(new)
+            return new
+
+    def live_generations(self):
+        with self._lock:
+            live = set(self._refs) | set(self._retired)
+            if self._current is not None:
+                live.add(self._current["generation"])
+            return sorted(live)
+
+def add_documents(manager, new_docs, with_tfidf=True):
+    """Writer: generasi baru = dokumen lama + new_docs (copy-on-write)."""
+    def build(old):
+        docs = dict(old["docs"]) if old else {}
+        docs.update(new_docs)
+        generation = old["generation"] + 1 if old else 1
+        extra = {}
+        if with_tfidf:
+            tfidf_docs, idf = compute_tf_idf(docs)
+            extra = {"tfidf_docs": MappingProxyType(tfidf_docs), "idf": MappingProxyType(idf)}
+        return build_snapshot(docs, generation, **extra)
+    return manager.update(build)
+
+
+#  BENCHMARK BACA/TULIS CAMPURAN
+
+def mixed_load_benchmark(manager, queries, new_batches, n_readers=4, duration_s=2.0):
+    """
+    Reader dari thread pool menjalankan query selama duration_s, sementara
+    satu writer menambahkan batch dokumen. Mengukur throughput dan
+    memeriksa konsistensi (hasil query hanya berisi dokumen generasi itu).
+    """
+    stop = threading.Event()
+    counts = [0] * n_readers
+    errors = []
+
+    def reader(i):
+        rng = random.Random(i)
+        while not stop.is_set():
+            with manager.reading() as snap:
+                q = rng.choice(queries)
+                hits = boolean_retrieve(q, snap["inverted"], snap["doc_ids"])
+                ranked = retrieve(q, snap["tfidf_docs"], snap["idf"], top_k=5)
+                if not set(hits) <= set(snap["docs"]) or any(d not in snap["docs"] for d, _ in ranked):
+                    errors.append(snap["generation"])
+            counts[i] += 1
+
+    publishes = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_readers) as pool:
+        futures = [pool.submit(reader, i) for i in range(n_readers)]
+        for batch in new_batches:
+            add_documents(manager, batch)
+            publishes += 1
+            if time.perf_counter() - start > duration_s:
+                break
+        remaining = duration_s - (time.perf_counter() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+        stop.set()
+        for f in futures:
+            f.result()
+    elapsed = time.perf_counter() - start
+    return {
+        "queries": sum(counts),
+        "qps": sum(counts) / elapsed,
+        "publishes": publishes,
+        "errors": len(errors),
+    }
+
+
+if __name__ == "__main__":
+    data_path = "data/processed"
+    docs = load_processed_docs(data_path)
+    if not docs:
+        exit(f"Tidak ada dokumen yang terbaca di folder '{data_path}'.")
+
+    reclaimed = []
+    manager = SnapshotManager(on_reclaim=lambda s: reclaimed.append(s["generation"]))
+    add_documents(manager, docs)
+
+    rng = random.Random(0)
+    sources = list(docs.values())
+    batches = [{f"new_{b}_{i}.txt": rng.choices(rng.choice(sources), k=200) for i in range(5)}
+               for b in range(50)]
+    queries = ["informas and sistem", "dokumen or query", "model and not boolean", "evaluas"]
+
+    for label, batch_list in (("baca saja", []), ("baca + tulis", batches)):
+        result = mixed_load_benchmark(manager, queries, batch_list)
+        print(f"{label:13} | {result['qps']:8.1f} query/s | {result['publishes']:3d} publish | "
+              f"inkonsisten: {result['errors']}")
+    print(f"Generasi aktif: {manager.current['generation']}, masih hidup: {manager.live_generations()}, "
+          f"direklamasi: {len(reclaimed)}")
@@ -1,15 +1,23 @@
 import os
 import re
 import math
+import numpy as np
 from collections import Counter, defaultdict
 from tabulate import tabulate  # pip install tabulate
 
+from corpus_store import store_path, load_docs_from_store, open_store, close_store, get_tokens, iter_term_counts
+from doc_stats import load_doc_stats, top_terms_snippet
+from fuzzy import resolve_term
+from near_dup import collapse_results, load_clusters
+
 #  LOAD DOKUMEN 
 def load_processed_docs(path="data/processed"):
     docs = {}
     if not os.path.exists(path):
         print(f"Folder {path} tidak ditemukan!")
         return docs
+    if os.path.exists(store_path(path)):
+        return load_docs_from_store(store_path(path))
     for filename in os.listdir(path):
         if filename.endswith(".txt"):
             with open(os.path.join(path, filename), "r", encoding="utf-8") as f:
@@ -17,7 +25,8 @@ def load_processed_docs(path="data/processed"):
     return docs
 
 #  HITUNG TF-IDF 
-def compute_tf_idf(docs):
+def compute_tf_idf(docs, doc_stats=None):
+    # doc_stats (lihat doc_stats.py) berisi max_tf yang sudah dihitung saat indexing
     N = len(docs)
     df = defaultdict(int)
     for tokens in docs.values():
@@ -29,14 +38,37 @@ def compute_tf_idf(docs):
     tfidf_docs = {}
     for doc_id, tokens in docs.items():
         tf = Counter(tokens)
-        max_tf = max(tf.values())
+        max_tf = doc_stats[doc_id]["max_tf"] if doc_stats else max(tf.values())
         tfidf_docs[doc_id] = {term: (tf[term] / max_tf) * idf[term] for term in tf}
 
     return tfidf_docs, idf
 
+def compute_tf_idf_from_store(store, doc_stats=None):
+    # sama seperti compute_tf_idf, tetapi dokumen di-stream dari corpus store (corpus_store.py):
+    # df dan tf dihitung dari array token id di mmap, hanya term unik yang diubah ke string
+    terms = store["terms"]
+    N = len(store["doc_ids"])
+    df = np.zeros(len(terms), dtype=np.int64)
+    for _, term_ids, _ in iter_term_counts(store):
+        df[term_ids] += 1
+
+    idf_arr = np.log10(N / np.maximum(df, 1))
+    idf = {terms[i]: float(idf_arr[i]) for i in np.flatnonzero(df).tolist()}
+
+    tfidf_docs = {}
+    for doc_id, term_ids, counts in iter_term_counts(store):
+        max_tf = doc_stats[doc_id]["max_tf"] if doc_stats else counts.max()
+        weights = counts / max_tf * idf_arr[term_ids]
+        tfidf_docs[doc_id] = dict(zip([terms[i] for i in term_ids.tolist()], weights.tolist()))
+
+    return tfidf_docs, idf
+
 #  VECTORIZE QUERY 
-def vectorize_query(query, idf):
+def vectorize_query(query, idf, fuzzy_index=None):
     tokens = re.findall(r"\b\w+\b", query.lower())
+    if fuzzy_index:
+        # term yang tidak ada di vocabulary diganti term terdekat (fuzzy.py)
+        tokens = [t if t in idf else resolve_term(fuzzy_index, t) or t for t in tokens]
     tf = Counter(tokens)
     query_vec = {term: (tf[term] * idf.get(term, 0)) for term in tf}
     return query_vec
@@ -49,11 +81,31 @@ def cosine_similarity(vec1, vec2):
     norm2 = math.sqrt(sum(v ** 2 for v in vec2.values()))
     return dot / (norm1 * norm2) if norm1 and norm2 else 0.0
 
+def doc_norms(tfidf_docs, doc_stats=None):
+    # norm L2 tiap dokumen: diambil dari doc_stats jika ada, selain itu dihitung sekali
+    if doc_stats:
+        return {doc: doc_stats[doc]["norms"]["tfidf"] for doc in tfidf_docs}
+    return {doc: math.sqrt(sum(w ** 2 for w in vec.values())) for doc, vec in tfidf_docs.items()}
+
+def score_documents(query_vec, tfidf_docs, norms=None):
+    # tanpa norms, cosine_similarity menghitung norm dokumen di setiap query
+    if norms is None:
+        return {doc: cosine_similarity(query_vec, vec) for doc, vec in tfidf_docs.items()}
+    q_norm = math.sqrt(sum(w ** 2 for w in query_vec.values()))
+    scores = {}
+    for doc, vec in tfidf_docs.items():
+        dot = sum(w * vec.get(t, 0.0) for t, w in query_vec.items())
+        scores[doc] = dot / (q_norm * norms[doc]) if q_norm and norms[doc] else 0.0
+    return scores
+
 #  RETRIEVE & RANK 
-def retrieve(query, tfidf_docs, idf, top_k=5):
-    query_vec = vectorize_query(query, idf)
-    scores = {doc: cosine_similarity(query_vec, vec) for doc, vec in tfidf_docs.items()}
+def retrieve(query, tfidf_docs, idf, top_k=5, fuzzy_index=None, clusters=None, norms=None):
+    query_vec = vectorize_query(query, idf, fuzzy_index)
+    scores = score_documents(query_vec, tfidf_docs, norms)
     ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    if clusters:
+        # satu dokumen per cluster near-duplicate (lihat near_dup.py)
+        ranked = collapse_results(ranked, clusters)
     return ranked[:top_k]
 
 #  EVALUASI METRIK 
@@ -87,16 +139,30 @@ def get_snippet(doc_tokens, char_len=120):
 
 #  MAIN PROGRAM 
 if __name__ == "__main__":
-    docs = load_processed_docs("data/processed")
-    if not docs:
+    data_path = "data/processed"
+    store = None
+    if os.path.exists(store_path(data_path)):
+        # corpus store: TF-IDF di-stream dari mmap, token snippet diambil per dokumen hasil
+        store = open_store(store_path(data_path))
+        doc_stats = load_doc_stats(data_path, dict(zip(store["doc_ids"], store["lengths"])))
+        tfidf_docs, idf = compute_tf_idf_from_store(store, doc_stats)
+        doc_tokens = lambda doc_id: get_tokens(store, doc_id)
+    else:
+        docs = load_processed_docs(data_path)
+        doc_stats = load_doc_stats(data_path, docs)
+        tfidf_docs, idf = compute_tf_idf(docs, doc_stats)
+        doc_tokens = docs.get
+    if not tfidf_docs:
         exit("Tidak ada dokumen yang terbaca di folder 'data/processed'.")
 
-    print(f"Jumlah dokumen terbaca: {len(docs)}")
-
-    tfidf_docs, idf = compute_tf_idf(docs)
+    print(f"Jumlah dokumen terbaca: {len(tfidf_docs)}")
+    # cluster near-duplicate dari preprocessing: satu dokumen per cluster di hasil
+    clusters = load_clusters(data_path)
+    # norm dokumen dari doc_stats, tidak dihitung ulang di setiap query
+    norms = doc_norms(tfidf_docs, doc_stats)
 
     #  GOLD SET (Task-C) 
-    file_list = set(docs.keys())
+    file_list = set(tfidf_docs.keys())
     queries = {
         "informasi and sistem": set(f for f in file_list if "Pengenalan" in f or "Vector Space Model" in f),
         "dokumen or query": set(f for f in file_list if "Preprocessing" in f or "Boolean Model" in f),
@@ -108,7 +174,7 @@ if __name__ == "__main__":
 
     for q, gold in queries.items():
         print(f"\nQUERY: {q}")
-        results = retrieve(q, tfidf_docs, idf, top_k=k)
+        results = retrieve(q, tfidf_docs, idf, top_k=k, clusters=clusters, norms=norms)
 
         if not results:
             print("Tidak ada dokumen yang cocok.")
@@ -117,7 +183,8 @@ if __name__ == "__main__":
         # Buat tabel rapih
         table_data = []
         for rank, (doc, score) in enumerate(results, 1):
-            snippet = get_snippet(docs[doc], char_len=120)
+            # ringkasan dari top term doc_stats, tanpa membaca isi dokumen
+            snippet = top_terms_snippet(doc_stats, doc) if doc_stats else get_snippet(doc_tokens(doc), char_len=120)
             table_data.append([rank, doc, round(score, 4), snippet])
 
         print(tabulate(table_data, headers=["Rank", "Doc ID", "Cosine", "Snippet"], tablefmt="grid"))
@@ -139,3 +206,5 @@ if __name__ == "__main__":
     print(f"Rata-rata MAP@{k}: {total_ap / n:.2f}")
     print(f"Rata-rata nDCG@{k}: {total_ndcg / n:.2f}")
     print("Evaluasi lengkap selesai.")
+    if store:
+        close_store(store)